@@ -22,6 +22,9 @@ OUTPUT_JSON_PATH = "articles.json"
 # ログファイルパス
 LOG_FILE_PATH = "fetch_rss.log"
 
+# RSSフィードのHTTPキャッシュ（ETag / Last-Modified と前回の記事）の保存先
+RSS_CACHE_PATH = "output/.rss_cache.json"
+
 # タイムアウト設定（秒）
 TIMEOUT_SECONDS = 10
 
@@ -42,3 +45,7 @@ FUSEKI_ENDPOINT = "http://172.28.64.1:3030"
 
 # データセット名
 FUSEKI_DATASET = "NewsKG"
+
+# データセットのTDB2データベースディレクトリ（--bulk-load 使用時）
+# Fusekiを停止して同じマシンで実行する場合のみ有効。例: "/fuseki/databases/NewsKG"
+FUSEKI_TDB_PATH = ""
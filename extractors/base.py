@@ -9,7 +9,7 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class Entity:
     """抽出されたエンティティを表すデータクラス"""
     id: str  # 辞書のID (例: "takaichi_sanae")
@@ -24,7 +24,7 @@ class Entity:
         return f"{base_ns}{self.entity_type}_{self.id}"
 
 
-@dataclass
+@dataclass(slots=True)
 class Statement:
     """抽出されたStatementを表すデータクラス"""
     id: str  # 一意識別子
@@ -58,16 +58,41 @@ class EntityExtractor:
             抽出されたEntityのリスト（重複排除済み）
         """
         # タイトルと本文を結合して検索
+        combined_text = self.build_article_text(article)
+
+        entities = self.extract(combined_text)
+
+        return self.unique_entities(entities)
+
+    @staticmethod
+    def build_article_text(article: dict) -> str:
+        """
+        記事のタイトル・要約・本文を結合した検索用テキストを生成
+
+        Args:
+            article: 記事辞書（title, content, summaryを含む）
+
+        Returns:
+            結合されたテキスト
+        """
         text_parts = [
             article.get("title", ""),
             article.get("summary", ""),
             article.get("content", ""),
         ]
-        combined_text = " ".join(filter(None, text_parts))
+        return " ".join(filter(None, text_parts))
 
-        entities = self.extract(combined_text)
+    @staticmethod
+    def unique_entities(entities: List[Entity]) -> List[Entity]:
+        """
+        エンティティをIDで重複排除（出現順を維持）
 
-        # IDで重複排除
+        Args:
+            entities: Entityのリスト
+
+        Returns:
+            重複排除済みのEntityのリスト
+        """
         seen_ids = set()
         unique_entities = []
         for entity in entities:
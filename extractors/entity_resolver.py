@@ -15,7 +15,7 @@ from pathlib import Path
 from dictionaries import DictionaryLoader, get_loader, DictionaryEntry
 
 
-@dataclass
+@dataclass(slots=True)
 class ResolvedEntity:
     """解決されたエンティティ"""
     id: str                    # URI用ID
@@ -97,6 +97,25 @@ class EntityResolver:
         # 新規エンティティとして処理
         return self._create_new_entity(text, entity_type)
     
+    def resolve_batch(self, pairs: List[Tuple[str, str]]) -> List[ResolvedEntity]:
+        """
+        複数のエンティティテキストをまとめて解決
+        
+        同じ (テキスト, タイプ) の組は1回だけ解決し、結果を共有する。
+        部分一致の辞書走査は1組につき1回で済む。
+        
+        Args:
+            pairs: (エンティティテキスト, エンティティタイプのヒント) のリスト
+        
+        Returns:
+            入力順のResolvedEntityのリスト
+        """
+        resolved: Dict[Tuple[str, str], ResolvedEntity] = {}
+        for pair in pairs:
+            if pair not in resolved:
+                resolved[pair] = self.resolve(*pair)
+        return [resolved[pair] for pair in pairs]
+    
     def _find_partial_match(self, text: str) -> Optional[Tuple[DictionaryEntry, float]]:
         """部分一致でエンティティを検索"""
         # 敬称や役職を除去してマッチング
@@ -81,6 +81,70 @@ class OpenRouterClient:
         Returns:
             LLMResponse
         """
+        payload = self._build_payload(
+            messages, temperature, max_tokens, response_format, reasoning
+        )
+        
+        with httpx.Client(timeout=self.timeout) as client:
+            response = client.post(
+                self.BASE_URL,
+                headers=self.headers,
+                json=payload
+            )
+            response.raise_for_status()
+            data = response.json()
+        
+        return self._parse_response(data)
+    
+    async def achat(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.3,
+        max_tokens: int = 4096,
+        response_format: Optional[Dict] = None,
+        reasoning: bool = True,
+        client: Optional[httpx.AsyncClient] = None
+    ) -> LLMResponse:
+        """
+        chat() の非同期版
+        
+        Args:
+            messages: メッセージリスト
+            temperature: 温度パラメータ
+            max_tokens: 最大トークン数
+            response_format: レスポンスフォーマット指定
+            reasoning: 推論モードを有効化
+            client: 共有するhttpx.AsyncClient（未指定なら呼び出しごとに作成）
+        
+        Returns:
+            LLMResponse
+        """
+        payload = self._build_payload(
+            messages, temperature, max_tokens, response_format, reasoning
+        )
+        
+        if client is None:
+            async with httpx.AsyncClient(timeout=self.timeout) as own_client:
+                response = await own_client.post(
+                    self.BASE_URL, headers=self.headers, json=payload
+                )
+        else:
+            response = await client.post(
+                self.BASE_URL, headers=self.headers, json=payload
+            )
+        response.raise_for_status()
+        
+        return self._parse_response(response.json())
+    
+    def _build_payload(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: int,
+        response_format: Optional[Dict],
+        reasoning: bool
+    ) -> Dict[str, Any]:
+        """リクエストペイロードを構築"""
         payload = {
             "model": self.model,
             "messages": messages,
@@ -94,16 +158,10 @@ class OpenRouterClient:
         if response_format:
             payload["response_format"] = response_format
         
-        with httpx.Client(timeout=self.timeout) as client:
-            response = client.post(
-                self.BASE_URL,
-                headers=self.headers,
-                json=payload
-            )
-            response.raise_for_status()
-            data = response.json()
-        
-        # レスポンスをパース
+        return payload
+    
+    def _parse_response(self, data: Dict[str, Any]) -> LLMResponse:
+        """APIレスポンスをLLMResponseに変換"""
         content = data["choices"][0]["message"]["content"]
         usage = data.get("usage", {})
         
@@ -145,8 +203,44 @@ class OpenRouterClient:
             reasoning=reasoning
         )
         
-        # JSONをパース
-        content = response.content.strip()
+        return self._parse_json_content(response.content)
+    
+    async def achat_json(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.2,
+        max_tokens: int = 4096,
+        reasoning: bool = True,
+        client: Optional[httpx.AsyncClient] = None
+    ) -> Dict[str, Any]:
+        """
+        chat_json() の非同期版
+        
+        Args:
+            messages: メッセージリスト
+            temperature: 温度パラメータ
+            max_tokens: 最大トークン数
+            reasoning: 推論モードを有効化
+            client: 共有するhttpx.AsyncClient
+        
+        Returns:
+            パースされたJSONオブジェクト
+        """
+        response = await self.achat(
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format={"type": "json_object"},
+            reasoning=reasoning,
+            client=client
+        )
+        
+        return self._parse_json_content(response.content)
+    
+    @staticmethod
+    def _parse_json_content(content: str) -> Dict[str, Any]:
+        """レスポンス本文をJSONとしてパース"""
+        content = content.strip()
         
         # コードブロックで囲まれている場合は除去
         if content.startswith("```json"):
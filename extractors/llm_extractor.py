@@ -7,6 +7,8 @@ LLMベースのトリプル抽出モジュール
 import json
 import hashlib
 import logging
+import httpx
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -14,7 +16,7 @@ from datetime import datetime
 from .llm_client import OpenRouterClient, get_client
 
 
-@dataclass
+@dataclass(slots=True)
 class Triple:
     """抽出されたトリプルを表すデータクラス"""
     subject: str           # 主語（エンティティ名）
@@ -99,6 +101,20 @@ JSON形式で以下の構造で出力してください：
 - 同じ情報の重複は避ける
 - 曖昧な表現は避け、具体的に記述"""
 
+# 複数記事をまとめて抽出する場合のシステムプロンプト
+MULTI_ARTICLE_SYSTEM_PROMPT = SYSTEM_PROMPT + """
+
+## 複数記事の場合
+複数の記事がまとめて与えられた場合は、記事ごとに以下の構造で出力してください：
+{
+  "articles": [
+    {
+      "id": "記事ID（入力の記事IDをそのまま使う）",
+      "triples": [ 上記と同じ形式のトリプル ]
+    }
+  ]
+}"""
+
 
 class LLMTripleExtractor:
     """LLMを使ったトリプル抽出クラス"""
@@ -120,6 +136,49 @@ class LLMTripleExtractor:
         Returns:
             ExtractionResult
         """
+        messages = self._build_messages(title, content)
+        
+        try:
+            response = self.client.chat_json(messages, temperature=0.2, reasoning=self.reasoning)
+            return self._build_result(response, title, article_id)
+            
+        except Exception as e:
+            self.logger.error(f"トリプル抽出エラー: {e}")
+            return self._error_result(e, title, article_id)
+    
+    async def extract_async(
+        self,
+        title: str,
+        content: str,
+        article_id: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None
+    ) -> ExtractionResult:
+        """
+        extract() の非同期版
+        
+        Args:
+            title: 記事タイトル
+            content: 記事本文
+            article_id: 記事ID（オプション）
+            http_client: 共有するhttpx.AsyncClient
+        
+        Returns:
+            ExtractionResult
+        """
+        messages = self._build_messages(title, content)
+        
+        try:
+            response = await self.client.achat_json(
+                messages, temperature=0.2, reasoning=self.reasoning, client=http_client
+            )
+            return self._build_result(response, title, article_id)
+            
+        except Exception as e:
+            self.logger.error(f"トリプル抽出エラー: {e}")
+            return self._error_result(e, title, article_id)
+    
+    def _build_messages(self, title: str, content: str) -> List[Dict[str, str]]:
+        """抽出用のメッセージを構築"""
         # 本文が長い場合は切り詰め（トークン制限対策）
         max_content_length = 3000
         if len(content) > max_content_length:
@@ -136,45 +195,60 @@ class LLMTripleExtractor:
 
 JSON形式で出力してください。"""
 
-        messages = [
+        return [
             {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": user_prompt}
         ]
-        
-        try:
-            response = self.client.chat_json(messages, temperature=0.2, reasoning=self.reasoning)
-            
-            # トリプルをパース
-            triples = []
-            for t in response.get("triples", []):
-                triple = Triple(
-                    subject=t.get("subject", ""),
-                    subject_type=t.get("subject_type", "other"),
-                    predicate=t.get("predicate", ""),
-                    object=t.get("object", ""),
-                    object_type=t.get("object_type", "other"),
-                    confidence=float(t.get("confidence", 0.5)),
-                    source_article_id=article_id
-                )
-                # 空のトリプルはスキップ
-                if triple.subject and triple.predicate and triple.object:
-                    triples.append(triple)
-            
-            return ExtractionResult(
-                article_id=article_id or "unknown",
-                article_title=title,
-                triples=triples,
-                raw_response=response
-            )
-            
-        except Exception as e:
-            self.logger.error(f"トリプル抽出エラー: {e}")
-            return ExtractionResult(
-                article_id=article_id or "unknown",
-                article_title=title,
-                triples=[],
-                raw_response={"error": str(e)}
+    
+    def _build_result(
+        self, response: Dict[str, Any], title: str, article_id: Optional[str]
+    ) -> ExtractionResult:
+        """LLMレスポンスからExtractionResultを構築"""
+        # トリプルをパース（抽出時刻は記事単位で1回だけ取得）
+        triples = []
+        extracted_at = datetime.utcnow()
+        for t in response.get("triples", []):
+            triple = Triple(
+                subject=t.get("subject", ""),
+                subject_type=t.get("subject_type", "other"),
+                predicate=t.get("predicate", ""),
+                object=t.get("object", ""),
+                object_type=t.get("object_type", "other"),
+                confidence=float(t.get("confidence", 0.5)),
+                source_article_id=article_id,
+                extraction_timestamp=extracted_at
             )
+            # 空のトリプルはスキップ
+            if triple.subject and triple.predicate and triple.object:
+                triples.append(triple)
+        
+        return ExtractionResult(
+            article_id=article_id or "unknown",
+            article_title=title,
+            triples=triples,
+            raw_response=response
+        )
+    
+    @staticmethod
+    def _error_result(
+        error: Exception, title: str, article_id: Optional[str]
+    ) -> ExtractionResult:
+        """抽出失敗時の空のExtractionResultを構築"""
+        return ExtractionResult(
+            article_id=article_id or "unknown",
+            article_title=title,
+            triples=[],
+            raw_response={"error": str(error)}
+        )
+    
+    @staticmethod
+    def _article_content(article: Dict[str, Any]) -> str:
+        """記事の本文を構築（summaryとcontentを結合）"""
+        content_parts = [
+            article.get("summary", ""),
+            article.get("content", "")
+        ]
+        return "\n".join(filter(None, content_parts))
     
     def extract_from_article(self, article: Dict[str, Any]) -> ExtractionResult:
         """
@@ -186,46 +260,196 @@ JSON形式で出力してください。"""
         Returns:
             ExtractionResult
         """
-        article_id = article.get("id", "unknown")
-        title = article.get("title", "")
+        return self.extract(
+            article.get("title", ""),
+            self._article_content(article),
+            article.get("id", "unknown")
+        )
+    
+    async def extract_from_article_async(
+        self,
+        article: Dict[str, Any],
+        http_client: Optional[httpx.AsyncClient] = None
+    ) -> ExtractionResult:
+        """
+        extract_from_article() の非同期版
         
-        # 本文を構築（summaryとcontentを結合）
-        content_parts = [
-            article.get("summary", ""),
-            article.get("content", "")
+        Args:
+            article: 記事辞書（id, title, content, summaryを含む）
+            http_client: 共有するhttpx.AsyncClient
+        
+        Returns:
+            ExtractionResult
+        """
+        return await self.extract_async(
+            article.get("title", ""),
+            self._article_content(article),
+            article.get("id", "unknown"),
+            http_client=http_client
+        )
+    
+    def extract_from_articles(self, articles: List[Dict[str, Any]]) -> List[ExtractionResult]:
+        """
+        複数記事を1回のLLMリクエストでまとめて抽出
+        
+        リクエストまたはレスポンスの解析に失敗した場合は記事ごとの抽出にフォールバックする。
+        
+        Args:
+            articles: 記事リスト
+        
+        Returns:
+            記事順のExtractionResultのリスト
+        """
+        if len(articles) <= 1:
+            return [self.extract_from_article(article) for article in articles]
+        
+        messages = self._build_multi_article_messages(articles)
+        
+        try:
+            response = self.client.chat_json(
+                messages,
+                temperature=0.2,
+                max_tokens=self._multi_article_max_tokens(articles),
+                reasoning=self.reasoning
+            )
+            return self._build_multi_article_results(response, articles)
+            
+        except Exception as e:
+            self.logger.error(f"複数記事のトリプル抽出エラー: {e} → 記事ごとに再試行")
+            return [self.extract_from_article(article) for article in articles]
+    
+    async def extract_from_articles_async(
+        self,
+        articles: List[Dict[str, Any]],
+        http_client: Optional[httpx.AsyncClient] = None
+    ) -> List[ExtractionResult]:
+        """
+        extract_from_articles() の非同期版
+        
+        Args:
+            articles: 記事リスト
+            http_client: 共有するhttpx.AsyncClient
+        
+        Returns:
+            記事順のExtractionResultのリスト
+        """
+        if len(articles) <= 1:
+            return [
+                await self.extract_from_article_async(article, http_client=http_client)
+                for article in articles
+            ]
+        
+        messages = self._build_multi_article_messages(articles)
+        
+        try:
+            response = await self.client.achat_json(
+                messages,
+                temperature=0.2,
+                max_tokens=self._multi_article_max_tokens(articles),
+                reasoning=self.reasoning,
+                client=http_client
+            )
+            return self._build_multi_article_results(response, articles)
+            
+        except Exception as e:
+            self.logger.error(f"複数記事のトリプル抽出エラー: {e} → 記事ごとに再試行")
+            return [
+                await self.extract_from_article_async(article, http_client=http_client)
+                for article in articles
+            ]
+    
+    def _build_multi_article_messages(self, articles: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+        """複数記事用のメッセージを構築"""
+        max_content_length = 3000
+        sections = []
+        for article in articles:
+            content = self._article_content(article)
+            if len(content) > max_content_length:
+                content = content[:max_content_length] + "..."
+            sections.append(
+                f"""### 記事ID: {article.get("id", "unknown")}
+## タイトル
+{article.get("title", "")}
+
+## 本文
+{content}"""
+            )
+        
+        user_prompt = f"""以下の{len(articles)}件のニュース記事から、記事ごとにトリプルを抽出してください。
+
+{chr(10).join(sections)}
+
+JSON形式で出力してください。"""
+
+        return [
+            {"role": "system", "content": MULTI_ARTICLE_SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt}
         ]
-        content = "\n".join(filter(None, content_parts))
+    
+    @staticmethod
+    def _multi_article_max_tokens(articles: List[Dict[str, Any]]) -> int:
+        """記事数に応じた最大出力トークン数"""
+        return max(4096, 1024 * len(articles))
+    
+    def _build_multi_article_results(
+        self, response: Dict[str, Any], articles: List[Dict[str, Any]]
+    ) -> List[ExtractionResult]:
+        """複数記事のレスポンスを記事ごとのExtractionResultに分割"""
+        by_id = {
+            str(item.get("id")): item
+            for item in response.get("articles", [])
+            if isinstance(item, dict)
+        }
         
-        return self.extract(title, content, article_id)
+        results = []
+        for article in articles:
+            article_id = article.get("id", "unknown")
+            item = by_id.get(str(article_id), {"triples": []})
+            results.append(
+                self._build_result(item, article.get("title", ""), article_id)
+            )
+        return results
     
     def extract_batch(
         self, 
         articles: List[Dict[str, Any]], 
-        progress_callback: Optional[callable] = None
+        progress_callback: Optional[callable] = None,
+        max_workers: int = 1
     ) -> List[ExtractionResult]:
         """
         複数記事からバッチでトリプルを抽出
+
+        max_workers > 1 の場合、I/O待ちが主なLLM呼び出しをスレッドプールで並行して実行する。
+        結果は記事順に返し、進捗コールバックは完了順に呼ばれる。
         
         Args:
             articles: 記事リスト
             progress_callback: 進捗コールバック関数 (current, total, result)
+            max_workers: 同時に実行するLLMリクエスト数（既定の1は逐次処理。
+                無料枠のモデルではレート制限に注意）
         
         Returns:
             ExtractionResultのリスト
         """
-        results = []
         total = len(articles)
+        results: List[Optional[ExtractionResult]] = [None] * total
         
-        for i, article in enumerate(articles):
-            result = self.extract_from_article(article)
-            results.append(result)
-            
-            if progress_callback:
-                progress_callback(i + 1, total, result)
-            
-            self.logger.info(
-                f"[{i+1}/{total}] {article.get('title', '')[:30]}... -> {len(result.triples)} triples"
-            )
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            futures = {
+                executor.submit(self.extract_from_article, article): i
+                for i, article in enumerate(articles)
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                i = futures[future]
+                result = future.result()
+                results[i] = result
+                
+                if progress_callback:
+                    progress_callback(done, total, result)
+                
+                self.logger.info(
+                    f"[{done}/{total}] {articles[i].get('title', '')[:30]}... -> {len(result.triples)} triples"
+                )
         
         return results
 
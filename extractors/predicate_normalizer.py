@@ -6,9 +6,13 @@
 """
 
 import json
+import asyncio
 import logging
+import sys
+import httpx
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Set, Tuple
 from dataclasses import dataclass, field
 from collections import Counter
 
@@ -37,7 +41,15 @@ class PredicateNormalizer:
         
         self.master_path = master_path
         self.predicates: Dict[str, PredicateEntry] = {}
-        self.alias_to_id: Dict[str, str] = {}
+        # 別名→述語IDの辞書本体。外部には読み取り専用ビューのみ公開する
+        self._alias_to_id: Dict[str, str] = {}
+        self.alias_to_id: Mapping[str, str] = MappingProxyType(self._alias_to_id)
+        # 部分一致用インデックス
+        #   _alias_rank: 別名 → 登録順位（線形走査時の優先順位）
+        #   _substr_index: 別名の部分文字列 → それを含む最初に登録された別名
+        self._alias_rank: Dict[str, int] = {}
+        self._substr_index: Dict[str, str] = {}
+        self._max_alias_len = 0
         self.unknown_predicates: Counter = Counter()  # 未知の述語をカウント
         self.logger = logging.getLogger(__name__)
         
@@ -54,17 +66,61 @@ class PredicateNormalizer:
         
         for p in data.get("predicates", []):
             entry = PredicateEntry(
-                id=p["id"],
-                label=p["label"],
+                id=sys.intern(p["id"]),
+                label=sys.intern(p["label"]),
                 aliases=p.get("aliases", []),
                 category=p.get("category", "other")
             )
             self.predicates[entry.id] = entry
             
             # ラベルとエイリアスをマッピング
-            self.alias_to_id[entry.label] = entry.id
-            for alias in entry.aliases:
-                self.alias_to_id[alias] = entry.id
+            self._register_aliases(entry)
+    
+    def _register_aliases(self, entry: PredicateEntry):
+        """ラベルとエイリアスを述語IDにマッピング（キーはintern済み）"""
+        for alias in (entry.label, *entry.aliases):
+            alias = sys.intern(alias)
+            self._alias_to_id[alias] = entry.id
+            self._index_alias(alias)
+    
+    def _index_alias(self, alias: str):
+        """別名を部分一致インデックスに登録（初回登録時のみ）"""
+        if alias in self._alias_rank:
+            return
+        self._alias_rank[alias] = len(self._alias_rank)
+        self._max_alias_len = max(self._max_alias_len, len(alias))
+        
+        n = len(alias)
+        for i in range(n):
+            for j in range(i + 1, n + 1):
+                self._substr_index.setdefault(alias[i:j], alias)
+    
+    def _find_partial_alias(self, predicate: str) -> Optional[str]:
+        """
+        部分一致する別名を検索
+        
+        「別名が述語に含まれる」または「述語が別名に含まれる」別名のうち、
+        登録順で最初のものを返す（全別名の線形走査と同じ結果）。
+        """
+        if not predicate:
+            # 空文字列は全ての別名に含まれる
+            return next(iter(self._alias_rank), None)
+        
+        rank = self._alias_rank
+        best = self._substr_index.get(predicate)
+        best_rank = rank[best] if best is not None else len(rank)
+        
+        # 述語の部分文字列のうち別名であるもの
+        if "" in rank and rank[""] < best_rank:
+            best, best_rank = "", rank[""]
+        n = len(predicate)
+        for i in range(n):
+            for j in range(i + 1, min(n, i + self._max_alias_len) + 1):
+                r = rank.get(predicate[i:j])
+                if r is not None and r < best_rank:
+                    best, best_rank = predicate[i:j], r
+        
+        return best
     
     def normalize(self, predicate: str) -> Tuple[str, str]:
         """
@@ -78,14 +134,15 @@ class PredicateNormalizer:
             マスターにない場合は (元の述語, 元の述語) を返す
         """
         # 完全一致
-        if predicate in self.alias_to_id:
-            pid = self.alias_to_id[predicate]
+        pid = self._alias_to_id.get(predicate)
+        if pid is not None:
             return pid, self.predicates[pid].label
         
         # 部分一致を試みる
-        for alias, pid in self.alias_to_id.items():
-            if alias in predicate or predicate in alias:
-                return pid, self.predicates[pid].label
+        alias = self._find_partial_alias(predicate)
+        if alias is not None:
+            pid = self._alias_to_id[alias]
+            return pid, self.predicates[pid].label
         
         # マスターにない場合
         self.unknown_predicates[predicate] += 1
@@ -129,9 +186,7 @@ class PredicateNormalizer:
         entry = PredicateEntry(id=id, label=label, aliases=aliases, category=category)
         self.predicates[id] = entry
         
-        self.alias_to_id[label] = id
-        for alias in aliases:
-            self.alias_to_id[alias] = id
+        self._register_aliases(entry)
     
     def save_master(self):
         """述語マスターを保存"""
@@ -178,17 +233,35 @@ JSON形式で以下の構造で出力してください：
 3. 「する」は省略する（例: 「発表する」→「発表」）
 4. 出現回数が多いものを優先的に代表形にする"""
 
-    def __init__(self, client: Optional[OpenRouterClient] = None, normalizer: Optional[PredicateNormalizer] = None):
+    # 1回のLLMリクエストで正規化する述語数
+    BATCH_SIZE = 50
+
+    def __init__(
+        self,
+        client: Optional[OpenRouterClient] = None,
+        normalizer: Optional[PredicateNormalizer] = None,
+        concurrency: int = 1
+    ):
+        """
+        Args:
+            client: LLMクライアント
+            normalizer: 述語正規化器
+            concurrency: LLMリクエストの同時実行数（1の場合は逐次処理）
+        """
         self.client = client or get_client()
         self.normalizer = normalizer or PredicateNormalizer()
+        self.concurrency = max(1, concurrency)
         self.logger = logging.getLogger(__name__)
     
-    def normalize_batch(self, predicates: List[str]) -> Dict[str, str]:
+    def normalize_batch(
+        self, predicates: List[str], counts: Optional[Mapping[str, int]] = None
+    ) -> Dict[str, str]:
         """
         述語リストをバッチで正規化
         
         Args:
             predicates: 正規化する述語のリスト
+            counts: 述語ごとの出現回数（省略時は predicates から数える）
         
         Returns:
             {元の述語: 正規化された述語} のマッピング
@@ -197,8 +270,8 @@ JSON形式で以下の構造で出力してください：
             return {}
         
         # 重複を除去してカウント
-        pred_counts = Counter(predicates)
-        unique_preds = list(pred_counts.keys())
+        pred_counts = counts if counts is not None else Counter(predicates)
+        unique_preds = list(dict.fromkeys(predicates))
         
         # まず既存マスターで正規化を試みる
         mapping = {}
@@ -217,20 +290,37 @@ JSON形式で以下の構造で出力してください：
                 mapping[pred] = pred
             return mapping
         
-        # LLMで正規化
-        try:
-            result = self._llm_normalize(unknown, pred_counts)
-            mapping.update(result)
-        except Exception as e:
-            self.logger.error(f"LLM正規化エラー: {e}")
-            # フォールバック: そのまま使用
-            for pred in unknown:
-                mapping[pred] = pred
+        # LLMで正規化（BATCH_SIZE件ずつ、可能なら並行して実行）
+        batches = [
+            unknown[i:i + self.BATCH_SIZE]
+            for i in range(0, len(unknown), self.BATCH_SIZE)
+        ]
+        if self.concurrency > 1 and len(batches) > 1:
+            results = asyncio.run(self._llm_normalize_all_async(batches, pred_counts))
+        else:
+            results = []
+            for batch in batches:
+                try:
+                    results.append(self._llm_normalize(batch, pred_counts))
+                except Exception as e:
+                    results.append(e)
+        
+        for batch, result in zip(batches, results):
+            if isinstance(result, BaseException):
+                self.logger.error(f"LLM正規化エラー: {result}")
+                # フォールバック: そのまま使用
+                for pred in batch:
+                    mapping[pred] = pred
+            else:
+                mapping.update(result)
+        
+        # マスターを保存
+        self.normalizer.save_master()
         
         return mapping
     
-    def _llm_normalize(self, predicates: List[str], counts: Counter) -> Dict[str, str]:
-        """LLMを使って述語を正規化"""
+    def _build_messages(self, predicates: List[str], counts: Mapping[str, int]) -> List[Dict[str, str]]:
+        """述語リストから正規化リクエストのメッセージを構築"""
         # 出現回数付きのリストを作成
         pred_list = [f"- {p} ({counts[p]}回)" for p in predicates]
         
@@ -240,14 +330,13 @@ JSON形式で以下の構造で出力してください：
 
 JSON形式で出力してください。"""
 
-        messages = [
+        return [
             {"role": "system", "content": self.SYSTEM_PROMPT},
             {"role": "user", "content": user_prompt}
         ]
-        
-        response = self.client.chat_json(messages, temperature=0.1)
-        
-        # 結果をマッピングに変換
+    
+    def _apply_groups(self, response: Dict) -> Dict[str, str]:
+        """LLMレスポンスのグループをマッピングに変換し、マスターに追加"""
         mapping = {}
         for group in response.get("groups", []):
             canonical = group.get("canonical", "")
@@ -267,10 +356,40 @@ JSON形式で出力してください。"""
                     category=category
                 )
         
-        # マスターを保存
-        self.normalizer.save_master()
-        
         return mapping
+    
+    def _llm_normalize(self, predicates: List[str], counts: Mapping[str, int]) -> Dict[str, str]:
+        """LLMを使って述語を正規化"""
+        messages = self._build_messages(predicates, counts)
+        response = self.client.chat_json(messages, temperature=0.1)
+        return self._apply_groups(response)
+    
+    async def _llm_normalize_async(
+        self,
+        predicates: List[str],
+        counts: Mapping[str, int],
+        sem: asyncio.Semaphore,
+        http_client: httpx.AsyncClient
+    ) -> Dict[str, str]:
+        """_llm_normalize() の非同期版（セマフォで同時実行数を制限）"""
+        messages = self._build_messages(predicates, counts)
+        async with sem:
+            response = await self.client.achat_json(
+                messages, temperature=0.1, client=http_client
+            )
+        return self._apply_groups(response)
+    
+    async def _llm_normalize_all_async(
+        self, batches: List[List[str]], counts: Mapping[str, int]
+    ) -> list:
+        """全バッチのLLM正規化を並行して実行（例外は結果として返す）"""
+        sem = asyncio.Semaphore(self.concurrency)
+        async with httpx.AsyncClient(timeout=self.client.timeout) as http_client:
+            tasks = [
+                self._llm_normalize_async(batch, counts, sem, http_client)
+                for batch in batches
+            ]
+            return await asyncio.gather(*tasks, return_exceptions=True)
 
 
 # シングルトンインスタンス
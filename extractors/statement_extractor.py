@@ -26,13 +26,20 @@ class StatementExtractor:
         self.disaster_patterns = DisasterPatterns()
         self.policy_patterns = PolicyPatterns()
 
-    def extract(self, text: str, article_id: str = None) -> List[Statement]:
+    def extract(
+        self,
+        text: str,
+        article_id: str = None,
+        entities: Optional[List[Entity]] = None,
+    ) -> List[Statement]:
         """
         テキストからStatementを抽出
 
         Args:
             text: 検索対象テキスト
             article_id: 記事ID（オプション）
+            entities: textから抽出済みのエンティティ（重複排除前）。
+                指定した場合は辞書による再スキャンを省略する
 
         Returns:
             抽出されたStatementのリスト
@@ -46,8 +53,9 @@ class StatementExtractor:
 
         all_matches = election_matches + disaster_matches + policy_matches
 
-        # テキスト全体からエンティティを抽出
-        entities = self.entity_extractor.extract(text)
+        # テキスト全体からエンティティを抽出（抽出済みなら再利用）
+        if entities is None:
+            entities = self.entity_extractor.extract(text)
 
         for i, match in enumerate(all_matches):
             # ユニークIDを生成
@@ -84,12 +92,7 @@ class StatementExtractor:
         article_id = article.get("id", "unknown")
 
         # タイトルと本文を結合
-        text_parts = [
-            article.get("title", ""),
-            article.get("summary", ""),
-            article.get("content", ""),
-        ]
-        combined_text = " ".join(filter(None, text_parts))
+        combined_text = self.entity_extractor.build_article_text(article)
 
         return self.extract(combined_text, article_id)
 
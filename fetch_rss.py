@@ -6,21 +6,23 @@ NHK RSS取得モジュール
 重複排除、エラーハンドリング、ログ出力機能を備えています。
 """
 
-import feedparser
 import hashlib
 import json
 import logging
 import time
 import sys
+from collections import Counter
 from datetime import datetime, timezone
-from dateutil import parser as date_parser
-from typing import List, Dict, Tuple
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util import Retry
+from operator import itemgetter
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple
 
 import config
 
+# feedparser / dateutil / requests は重いため、使用する関数内で遅延インポートする
+if TYPE_CHECKING:
+    import requests
+
 
 def setup_logging():
     """ログ設定を初期化"""
@@ -35,8 +37,12 @@ def setup_logging():
     )
 
 
-def create_session() -> requests.Session:
+def create_session() -> "requests.Session":
     """リトライ機能付きのHTTPセッションを作成"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util import Retry
+
     session = requests.Session()
 
     # User-Agentヘッダーを設定（403 Forbiddenエラー回避）
@@ -86,6 +92,8 @@ def parse_date(date_str: str) -> Tuple[str, int]:
     Returns:
         (ISO 8601形式の文字列, Unixタイムスタンプ)
     """
+    from dateutil import parser as date_parser
+
     try:
         dt = date_parser.parse(date_str)
         # タイムゾーン情報がない場合はUTCとして扱う
@@ -167,35 +175,127 @@ def extract_article_info(entry: Dict, source_url: str) -> Dict:
     }
 
 
-def fetch_feed(feed_url: str, session: requests.Session) -> List[Dict]:
+def load_feed_cache(cache_path: str) -> Dict[str, Dict]:
     """
-    単一のRSSフィードを取得して記事リストを返す
+    フィードのHTTPキャッシュを読み込み
+
+    Args:
+        cache_path: キャッシュファイルのパス
+
+    Returns:
+        {フィードURL: {"etag", "last_modified", "articles"}} の辞書
+    """
+    path = Path(cache_path)
+    if not path.exists():
+        return {}
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        logging.warning(f"キャッシュ読み込みエラー: {cache_path} - {e}")
+        return {}
+
+
+def save_feed_cache(cache: Dict[str, Dict], cache_path: str):
+    """
+    フィードのHTTPキャッシュを保存
+
+    Args:
+        cache: キャッシュ辞書
+        cache_path: キャッシュファイルのパス
+    """
+    path = Path(cache_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, ensure_ascii=False)
+
+
+def download_feed(
+    feed_url: str,
+    session: "requests.Session",
+    cache: Optional[Dict[str, Dict]] = None
+) -> Optional[Dict]:
+    """
+    単一のRSSフィードを取得（パースは行わない）
+
+    cacheを渡した場合、HTTP(S)フィードには If-None-Match / If-Modified-Since
+    を付けて条件付きリクエストを行います。
 
     Args:
         feed_url: RSSフィードのURL
         session: HTTPセッション
+        cache: フィードのHTTPキャッシュ
 
     Returns:
-        記事情報のリスト
+        取得結果の辞書。エラー時はNone
+        - source: feedparserに渡すデータ（bytesまたはローカルパス）。304時はNone
+        - articles: 304時のキャッシュ済み記事リスト
+        - etag / last_modified: レスポンスのキャッシュ検証子
     """
-    articles = []
+    import requests
+
+    cached = cache.get(feed_url) if cache is not None else None
 
     try:
         logging.info(f"Fetching {feed_url} ...")
 
         # ローカルファイルの場合は直接読み込み
         if feed_url.startswith('file://'):
-            file_path = feed_url.replace('file://', '')
-            feed = feedparser.parse(file_path)
+            return {'source': feed_url.replace('file://', '')}
         # ローカルパスの場合（相対パスまたは絶対パス）
-        elif not feed_url.startswith('http://') and not feed_url.startswith('https://'):
-            feed = feedparser.parse(feed_url)
-        else:
-            # RSSフィードを取得
-            response = session.get(feed_url, timeout=config.TIMEOUT_SECONDS)
-            response.raise_for_status()
-            # フィードをパース
-            feed = feedparser.parse(response.content)
+        if not feed_url.startswith('http://') and not feed_url.startswith('https://'):
+            return {'source': feed_url}
+
+        # 前回のETag / Last-Modifiedで条件付きリクエスト
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        # RSSフィードを取得
+        response = session.get(
+            feed_url, headers=headers, timeout=config.TIMEOUT_SECONDS
+        )
+        if response.status_code == 304 and cached:
+            return {'source': None, 'articles': cached.get('articles', [])}
+        response.raise_for_status()
+
+        return {
+            'source': response.content,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        }
+
+    except requests.exceptions.Timeout:
+        logging.error(f"タイムアウト: {feed_url}")
+    except requests.exceptions.RequestException as e:
+        logging.error(f"フィード取得エラー: {feed_url} - {e}")
+    except Exception as e:
+        logging.error(f"予期しないエラー: {feed_url} - {e}")
+
+    return None
+
+
+def parse_feed(source, feed_url: str) -> List[Dict]:
+    """
+    取得済みのRSSフィードをパースして記事リストを返す
+
+    Args:
+        source: feedparserに渡すデータ（bytesまたはローカルパス）
+        feed_url: RSSフィードのURL
+
+    Returns:
+        記事情報のリスト
+    """
+    import feedparser
+
+    articles = []
+
+    try:
+        feed = feedparser.parse(source)
 
         # エントリーが存在しない場合
         if not feed.entries:
@@ -215,15 +315,61 @@ def fetch_feed(feed_url: str, session: requests.Session) -> List[Dict]:
                 )
                 continue
 
-        logging.info(f"✓ Fetched {len(articles)} articles from {feed_url}")
-
-    except requests.exceptions.Timeout:
-        logging.error(f"タイムアウト: {feed_url}")
-    except requests.exceptions.RequestException as e:
-        logging.error(f"フィード取得エラー: {feed_url} - {e}")
     except Exception as e:
-        logging.error(f"予期しないエラー: {feed_url} - {e}")
+        logging.error(f"RSSパースエラー: {feed_url} - {e}")
+
+    return articles
+
+
+def _update_feed_cache(
+    cache: Optional[Dict[str, Dict]],
+    feed_url: str,
+    download: Dict,
+    articles: List[Dict]
+):
+    """次回の条件付きリクエスト用にキャッシュを更新"""
+    if cache is None:
+        return
+    etag = download.get('etag')
+    last_modified = download.get('last_modified')
+    if etag or last_modified:
+        cache[feed_url] = {
+            'etag': etag,
+            'last_modified': last_modified,
+            'articles': articles,
+        }
+
+
+def fetch_feed(
+    feed_url: str,
+    session: "requests.Session",
+    cache: Optional[Dict[str, Dict]] = None
+) -> List[Dict]:
+    """
+    単一のRSSフィードを取得して記事リストを返す
+
+    cacheを渡した場合、304なら前回の記事をそのまま返します。
+
+    Args:
+        feed_url: RSSフィードのURL
+        session: HTTPセッション
+        cache: フィードのHTTPキャッシュ（更新される）
 
+    Returns:
+        記事情報のリスト
+    """
+    download = download_feed(feed_url, session, cache)
+    if download is None:
+        return []
+
+    if download['source'] is None:
+        articles = download['articles']
+        logging.info(f"✓ 変更なし (304): {len(articles)} articles from {feed_url}")
+        return articles
+
+    articles = parse_feed(download['source'], feed_url)
+    logging.info(f"✓ Fetched {len(articles)} articles from {feed_url}")
+    _update_feed_cache(cache, feed_url, download, articles)
     return articles
 
 
@@ -231,20 +377,53 @@ def fetch_feeds(feed_urls: List[str]) -> List[Dict]:
     """
     複数のRSSフィードを取得
 
+    ダウンロードはセッションを共有して順番に行い、
+    取得できたフィードをまとめてパースします。
+    （スケジューラからサーバープロセス内で呼ばれるため、プロセスプールは使いません）
+
     Args:
         feed_urls: RSSフィードURLのリスト
 
     Returns:
         全記事のリスト
     """
-    all_articles = []
     session = create_session()
+    cache_path = getattr(config, "RSS_CACHE_PATH", None)
+    cache = load_feed_cache(cache_path) if cache_path else None
 
+    # ダウンロード
+    downloads = []
     for feed_url in feed_urls:
-        articles = fetch_feed(feed_url, session)
-        all_articles.extend(articles)
+        downloads.append((feed_url, download_feed(feed_url, session, cache)))
         time.sleep(0.5)  # 各フィード取得の間に少し待機
 
+    # パース（304やエラーのフィードは対象外）
+    to_parse = [
+        (feed_url, download) for feed_url, download in downloads
+        if download is not None and download['source'] is not None
+    ]
+    parsed_by_url = {
+        feed_url: parse_feed(download['source'], feed_url)
+        for feed_url, download in to_parse
+    }
+
+    # フィード順に記事を集約
+    all_articles = []
+    for feed_url, download in downloads:
+        if download is None:
+            continue
+        if download['source'] is None:
+            articles = download['articles']
+            logging.info(f"✓ 変更なし (304): {len(articles)} articles from {feed_url}")
+        else:
+            articles = parsed_by_url[feed_url]
+            logging.info(f"✓ Fetched {len(articles)} articles from {feed_url}")
+            _update_feed_cache(cache, feed_url, download, articles)
+        all_articles.extend(articles)
+
+    if cache is not None:
+        save_feed_cache(cache, cache_path)
+
     return all_articles
 
 
@@ -307,13 +486,14 @@ def main():
     unique_articles, duplicates_count = remove_duplicates(all_articles)
 
     # 公開日時でソート（新しい順）
-    unique_articles.sort(key=lambda x: x.get('pubDateUnix', 0), reverse=True)
+    # extract_article_info は常に pubDateUnix を設定するため、
+    # lambda ではなくC実装の itemgetter をキー関数に使う
+    unique_articles.sort(key=itemgetter('pubDateUnix'), reverse=True)
 
     # ソース別の記事数をカウント
-    sources_count = {}
-    for article in unique_articles:
-        source = article.get('source', 'unknown')
-        sources_count[source] = sources_count.get(source, 0) + 1
+    sources_count = dict(Counter(
+        article.get('source', 'unknown') for article in unique_articles
+    ))
 
     # 実行時間を計算
     execution_time = time.time() - start_time
@@ -6,17 +6,48 @@ RDFから未正規化述語を抽出し、LLMで正規化してマスター辞
 import os
 import re
 import json
+import mmap
+import asyncio
+import httpx
 from pathlib import Path
 from collections import Counter
-from typing import Dict, List, Set
+from typing import Dict, List, Set, Tuple
 from dotenv import load_dotenv
 from extractors.llm_client import get_client
 
+try:
+    import orjson
+except ImportError:  # orjson未導入時は標準jsonで書き出す
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:  # uvloop未導入（Windows等）は標準のイベントループを使う
+    uvloop = None
+
 load_dotenv()
 
 RDF_FILE = Path("output/knowledge_graph_v2.ttl")
 PREDICATE_MASTER_FILE = Path("dictionaries/predicates/predicate_master.json")
 
+# reificationの rdf:predicate 行から述語名を取り出すパターン
+# （bytes上で走査するため、\w に加えてUTF-8のマルチバイト文字も許可する）
+PRED_NEEDLE = b'rdf:predicate'
+PRED_PATTERN = re.compile(rb'rdf:predicate\s+newskg:rel_((?:\w|[\x80-\xff])+)\s+[;.]')
+
+# 述語IDの区切り文字（空白・中黒）をまとめて "_" に置換する変換表
+_ID_TRANS = str.maketrans({" ": "_", "・": "_"})
+
+# LLMへの同時リクエスト数（レート制限に合わせて環境変数で調整）
+LLM_CONCURRENCY = int(os.getenv("NEWSKG_LLM_CONCURRENCY", "8"))
+
+# 1リクエストに含める述語数の上限（トークン予算による分割と併用。NEWSKG_LLM_BATCH_SIZE で変更可能）
+LLM_BATCH_SIZE = int(os.getenv("NEWSKG_LLM_BATCH_SIZE", "80"))
+
+# 1リクエストあたりの推定トークン予算（入力の述語リスト / 出力JSON）
+LLM_PROMPT_TOKEN_BUDGET = int(os.getenv("NEWSKG_LLM_PROMPT_TOKEN_BUDGET", "3500"))
+LLM_OUTPUT_TOKEN_BUDGET = int(os.getenv("NEWSKG_LLM_OUTPUT_TOKEN_BUDGET", "3000"))
+
 SYSTEM_PROMPT = """あなたは日本語の述語（動詞・動作を表す語句）を正規化する専門家です。
 
 ## タスク
@@ -41,20 +72,42 @@ JSON形式で以下の構造で出力してください：
 4. 出現回数が多いものを優先的に代表形にする
 5. 英語のIDは日本語の意味を表す動詞形にする（例: announce → 発表）"""
 
+# システムプロンプトをプロンプトキャッシュ対象としてマーク
+# （OpenRouter経由のAnthropic/Geminiモデルは cache_control で共通プレフィックスを再利用する。
+#   OpenAI系モデルは同一プレフィックスを自動でキャッシュするため指定は無視される）
+# 非対応プロバイダでエラーになる場合は NEWSKG_PROMPT_CACHE=0 で無効化する
+PROMPT_CACHE = os.getenv("NEWSKG_PROMPT_CACHE", "1") != "0"
+
+if PROMPT_CACHE:
+    SYSTEM_MESSAGE = {
+        "role": "system",
+        "content": [
+            {"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}
+        ],
+    }
+else:
+    SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+
 def extract_predicates_from_rdf(rdf_file: Path) -> Counter:
     """RDFファイルから述語とその出現回数を抽出"""
     print(f"RDFファイルを読み込み中: {rdf_file}")
     
     predicates = Counter()
-    pred_pattern = re.compile(r'rdf:predicate\s+(newskg:rel_\w+)\s+[;.]')
     
-    with open(rdf_file, 'r', encoding='utf-8') as f:
-        for line in f:
-            match = pred_pattern.search(line)
-            if match:
-                pred_uri = match.group(1)
-                pred_name = pred_uri.replace('newskg:rel_', '')
-                predicates[pred_name] += 1
+    # ファイル全体をmmapし、bytes.find で rdf:predicate の出現位置だけを探してから
+    # その位置で正規表現を照合する（行ごとのPythonループとデコードを避ける）
+    with open(rdf_file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                pos = mm.find(PRED_NEEDLE)
+                while pos != -1:
+                    m = PRED_PATTERN.match(mm, pos)
+                    if m:
+                        predicates[m.group(1)] += 1
+                    pos = mm.find(PRED_NEEDLE, pos + len(PRED_NEEDLE))
+    predicates = Counter({
+        name.decode('utf-8'): count for name, count in predicates.items()
+    })
     
     print(f"抽出完了: {len(predicates)} 種類の述語")
     return predicates
@@ -67,6 +120,16 @@ def load_existing_master(master_file: Path) -> Dict:
     with open(master_file, 'r', encoding='utf-8') as f:
         return json.load(f)
 
+def _write_master(master_file: Path, master_data: Dict):
+    """マスター辞書を書き出し"""
+    master_file.parent.mkdir(parents=True, exist_ok=True)
+    if orjson is not None:
+        with open(master_file, 'wb') as f:
+            f.write(orjson.dumps(master_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(master_file, 'w', encoding='utf-8') as f:
+            json.dump(master_data, f, ensure_ascii=False, indent=2)
+
 def get_normalized_predicates(master_data: Dict) -> Set[str]:
     """既に正規化済みの述語IDセットを取得"""
     normalized = set()
@@ -75,51 +138,140 @@ def get_normalized_predicates(master_data: Dict) -> Set[str]:
         normalized.update(pred.get('aliases', []))
     return normalized
 
-def normalize_predicates_with_llm(predicates: List[str], counts: Counter, batch_size: int = 100) -> List[Dict]:
-    """LLMを使って述語を正規化"""
-    client = get_client()
-    all_groups = []
+def _build_batch_messages(batch: List[str], counts: Counter) -> List[Dict]:
+    """バッチ用のメッセージを構築"""
+    pred_list = [f"- {p} ({counts[p]}回)" for p in batch]
     
-    total_batches = (len(predicates) + batch_size - 1) // batch_size
-    
-    for i in range(0, len(predicates), batch_size):
-        batch = predicates[i:i+batch_size]
-        batch_num = i // batch_size + 1
-        
-        print(f"\nバッチ {batch_num}/{total_batches} を処理中... ({len(batch)} 述語)")
-        
-        pred_list = [f"- {p} ({counts[p]}回)" for p in batch]
-        
-        user_prompt = f"""以下の述語リストを正規化してください。括弧内は出現回数です。
+    user_prompt = f"""以下の述語リストを正規化してください。括弧内は出現回数です。
 
 {chr(10).join(pred_list)}
 
 JSON形式で出力してください。"""
-        
-        messages = [
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": user_prompt}
+    
+    return [
+        SYSTEM_MESSAGE,
+        {"role": "user", "content": user_prompt}
+    ]
+
+def _estimate_tokens(pred: str) -> Tuple[int, int]:
+    """述語1件あたりの推定トークン数（入力行, 出力JSON）を返す簡易見積もり"""
+    base = int(len(pred) * 1.5)
+    return base + 8, base + 12
+
+def _pack_batches(predicates: List[str], counts: Counter, batch_size: int) -> List[List[str]]:
+    """
+    出現回数の多い順に並べ、推定トークン予算に収まるよう貪欲にバッチへ詰める
+    
+    短い述語ほど1バッチに多く入る。1バッチの述語数は batch_size を上限とする。
+    """
+    batches = []
+    batch = []
+    prompt_tokens = output_tokens = 0
+    for pred in sorted(predicates, key=lambda p: counts[p], reverse=True):
+        pred_in, pred_out = _estimate_tokens(pred)
+        if batch and (
+            len(batch) >= batch_size
+            or prompt_tokens + pred_in > LLM_PROMPT_TOKEN_BUDGET
+            or output_tokens + pred_out > LLM_OUTPUT_TOKEN_BUDGET
+        ):
+            batches.append(batch)
+            batch = []
+            prompt_tokens = output_tokens = 0
+        batch.append(pred)
+        prompt_tokens += pred_in
+        output_tokens += pred_out
+    if batch:
+        batches.append(batch)
+    return batches
+
+def _identity_groups(batch: List[str]) -> List[Dict]:
+    """正規化に失敗した述語をそのまま代表形とするグループを生成"""
+    return [
+        {"canonical": pred, "members": [pred], "category": "other"}
+        for pred in batch
+    ]
+
+async def _normalize_batch_async(client, http_client, batch: List[str], counts: Counter, sem: asyncio.Semaphore) -> List[Dict]:
+    """
+    1バッチをLLMで正規化（セマフォで同時実行数を制限）
+    
+    レスポンスのJSONパースに失敗した場合はバッチを二分して再試行し、
+    成功した部分の結果を活かす。1述語まで分割しても失敗した場合は例外を送出する。
+    """
+    messages = _build_batch_messages(batch, counts)
+    try:
+        async with sem:
+            response = await client.achat_json(messages, temperature=0.1, client=http_client)
+    except ValueError as e:
+        if len(batch) <= 1:
+            raise
+        print(f"  JSONパースエラー ({len(batch)} 述語): {e} → 分割して再試行")
+        mid = len(batch) // 2
+        halves = (batch[:mid], batch[mid:])
+        results = await asyncio.gather(
+            *(_normalize_batch_async(client, http_client, half, counts, sem) for half in halves),
+            return_exceptions=True
+        )
+        groups = []
+        for half, result in zip(halves, results):
+            if isinstance(result, Exception):
+                groups.extend(_identity_groups(half))
+            else:
+                groups.extend(result)
+        return groups
+    return response.get("groups", [])
+
+async def _normalize_batches_async(client, batches: List[List[str]], counts: Counter, max_concurrency: int) -> list:
+    """全バッチを並行してLLMに送信"""
+    sem = asyncio.Semaphore(max_concurrency)
+    async with httpx.AsyncClient(timeout=client.timeout) as http_client:
+        tasks = [
+            _normalize_batch_async(client, http_client, batch, counts, sem)
+            for batch in batches
         ]
-        
-        try:
-            response = client.chat_json(messages, temperature=0.1)
-            groups = response.get("groups", [])
-            all_groups.extend(groups)
-            print(f"  → {len(groups)} グループに正規化")
-        except Exception as e:
-            print(f"  エラー: {e}")
-            for pred in batch:
-                all_groups.append({
-                    "canonical": pred,
-                    "members": [pred],
-                    "category": "other"
-                })
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+def _run_async(coro):
+    """コルーチンを実行（uvloopがあればそのイベントループを使う）"""
+    if uvloop is None:
+        return asyncio.run(coro)
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+        return runner.run(coro)
+
+def normalize_predicates_with_llm(predicates: List[str], counts: Counter, batch_size: int = None, max_concurrency: int = None) -> List[Dict]:
+    """LLMを使って述語を正規化（バッチを並行送信）"""
+    client = get_client()
+    all_groups = []
+    
+    if batch_size is None:
+        batch_size = LLM_BATCH_SIZE
+    if max_concurrency is None:
+        max_concurrency = LLM_CONCURRENCY
+    
+    batches = _pack_batches(predicates, counts, batch_size)
+    total_batches = len(batches)
+    
+    print(f"\n{total_batches} バッチを処理中... (同時実行数: {max_concurrency})")
+    results = _run_async(_normalize_batches_async(client, batches, counts, max_concurrency))
+    
+    for batch_num, (batch, result) in enumerate(zip(batches, results), 1):
+        if isinstance(result, Exception):
+            print(f"  バッチ {batch_num}/{total_batches} エラー: {result}")
+            all_groups.extend(_identity_groups(batch))
+        else:
+            all_groups.extend(result)
+            print(f"  バッチ {batch_num}/{total_batches}: {len(batch)} 述語 → {len(result)} グループに正規化")
     
     return all_groups
 
-def update_master_dictionary(master_file: Path, new_groups: List[Dict]):
-    """マスター辞書に新しい述語グループを追加"""
-    master_data = load_existing_master(master_file)
+def update_master_dictionary(master_file: Path, new_groups: List[Dict], master_data: Dict = None):
+    """マスター辞書に新しい述語グループを追加（読み込み済みの master_data があれば再利用）"""
+    if not new_groups:
+        print("\nマスター辞書の更新なし: 新しいグループがありません")
+        return
+    
+    if master_data is None:
+        master_data = load_existing_master(master_file)
     
     existing_ids = {p['id'] for p in master_data.get("predicates", [])}
     
@@ -132,7 +284,7 @@ def update_master_dictionary(master_file: Path, new_groups: List[Dict]):
         if not canonical:
             continue
         
-        pred_id = canonical.replace(" ", "_").replace("・", "_").lower()
+        pred_id = canonical.translate(_ID_TRANS).lower()
         
         if pred_id in existing_ids:
             continue
@@ -147,9 +299,11 @@ def update_master_dictionary(master_file: Path, new_groups: List[Dict]):
         existing_ids.add(pred_id)
         added_count += 1
     
-    master_file.parent.mkdir(parents=True, exist_ok=True)
-    with open(master_file, 'w', encoding='utf-8') as f:
-        json.dump(master_data, f, ensure_ascii=False, indent=2)
+    if added_count == 0:
+        print("\nマスター辞書の更新なし: 追加対象の述語がありません")
+        return
+    
+    _write_master(master_file, master_data)
     
     print(f"\nマスター辞書を更新: {added_count} 件追加")
     print(f"保存先: {master_file}")
@@ -186,9 +340,9 @@ def main():
         print(f"  {pred}: {count}回")
     
     print(f"\nLLMで正規化を開始...")
-    new_groups = normalize_predicates_with_llm(unknown_predicates, predicates, batch_size=80)
+    new_groups = normalize_predicates_with_llm(unknown_predicates, predicates)
     
-    update_master_dictionary(PREDICATE_MASTER_FILE, new_groups)
+    update_master_dictionary(PREDICATE_MASTER_FILE, new_groups, master_data)
     
     print("\n✓ 述語正規化が完了しました")
     print(f"次のステップ: uv run python test_triple_extraction.py --pipeline --max-articles 490")
@@ -4,8 +4,15 @@ Fusekiアップローダーモジュール
 生成されたRDFデータをApache Jena Fusekiサーバーにアップロードします。
 """
 
+import mmap
+import os
+import shutil
+import subprocess
 import requests
-from typing import Optional, Dict, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from rdflib import Graph, BNode
+from typing import Optional, Dict, Any, List, Tuple
 from pathlib import Path
 import logging
 
@@ -16,22 +23,53 @@ class FusekiUploader:
     def __init__(
         self,
         endpoint: str = "http://localhost:3030",
-        dataset: str = "NewsKG"
+        dataset: str = "NewsKG",
+        pool_maxsize: int = 16
     ):
         """
         Args:
             endpoint: Fusekiサーバーのベースエンドポイント
             dataset: データセット名
+            pool_maxsize: HTTPコネクションプールの最大接続数
         """
         self.endpoint = endpoint.rstrip("/")
         self.dataset = dataset
         self.logger = logging.getLogger(__name__)
 
+        # 全リクエストで共有するセッション（keep-aliveで接続を再利用）
+        self.session = self._create_session(pool_maxsize)
+
         # エンドポイントURL
         self.data_endpoint = f"{self.endpoint}/{dataset}/data"
         self.query_endpoint = f"{self.endpoint}/{dataset}/query"
         self.update_endpoint = f"{self.endpoint}/{dataset}/update"
 
+    @staticmethod
+    def _create_session(pool_maxsize: int) -> requests.Session:
+        """コネクションプールとリトライ設定付きのセッションを作成"""
+        session = requests.Session()
+        # ボディ付きリクエスト（ファイルのストリーム送信）は再送できないため、
+        # ステータス/読み取りエラーでのリトライは GET/HEAD に限定する
+        retry = Retry(
+            total=3,
+            backoff_factor=0.2,
+            allowed_methods=frozenset(["GET", "HEAD"])
+        )
+        adapter = HTTPAdapter(pool_maxsize=pool_maxsize, max_retries=retry)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def close(self):
+        """セッションを閉じる"""
+        self.session.close()
+
+    def __enter__(self) -> "FusekiUploader":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def check_connection(self) -> bool:
         """
         Fusekiサーバーへの接続を確認
@@ -40,7 +78,8 @@ class FusekiUploader:
             接続成功ならTrue
         """
         try:
-            response = requests.get(f"{self.endpoint}/$/ping", timeout=5)
+            # ボディを返さない HEAD で死活確認のみ行う
+            response = self.session.head(f"{self.endpoint}/$/ping", timeout=2)
             return response.status_code == 200
         except requests.RequestException as e:
             self.logger.error(f"Fuseki接続エラー: {e}")
@@ -50,7 +89,8 @@ class FusekiUploader:
         self,
         file_path: str,
         graph_uri: Optional[str] = None,
-        replace: bool = False
+        replace: bool = False,
+        data: Optional[bytes] = None
     ) -> Dict[str, Any]:
         """
         RDFファイルをFusekiにアップロード
@@ -59,12 +99,14 @@ class FusekiUploader:
             file_path: アップロードするRDFファイルのパス
             graph_uri: 名前付きグラフのURI（Noneの場合はデフォルトグラフ）
             replace: Trueの場合、既存データを置換
+            data: ファイルの内容（指定時はファイルを読まずにこのバイト列を送信し、
+                file_path は Content-Type の判定にのみ使う）
 
         Returns:
             アップロード結果の辞書
         """
         file_path = Path(file_path)
-        if not file_path.exists():
+        if data is None and not file_path.exists():
             return {
                 "success": False,
                 "error": f"ファイルが見つかりません: {file_path}"
@@ -92,12 +134,12 @@ class FusekiUploader:
         method = "PUT" if replace else "POST"
 
         try:
-            with open(file_path, "rb") as f:
-                headers = {"Content-Type": content_type}
-                if method == "PUT":
-                    response = requests.put(url, data=f, headers=headers, timeout=60)
-                else:
-                    response = requests.post(url, data=f, headers=headers, timeout=60)
+            headers = {"Content-Type": content_type}
+            send = self.session.put if method == "PUT" else self.session.post
+            if data is not None:
+                response = send(url, data=data, headers=headers, timeout=60)
+            else:
+                response = self._send_file(send, url, file_path, headers)
 
             if response.status_code in (200, 201, 204):
                 self.logger.info(f"アップロード成功: {file_path}")
@@ -124,6 +166,125 @@ class FusekiUploader:
                 "error": str(e),
             }
 
+    @staticmethod
+    def _send_file(send, url: str, file_path: Path, headers: Dict[str, str]) -> requests.Response:
+        """ファイルの内容を送信（mmapしたページキャッシュをそのまま渡す）"""
+        with open(file_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return send(url, data=f, headers=headers, timeout=60)
+            # ユーザー空間でのコピーを避ける
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                    memoryview(mm) as view:
+                headers = {**headers, "Content-Length": str(size)}
+                return send(url, data=view, headers=headers, timeout=60)
+
+    @staticmethod
+    def _tdb_lock_owner(tdb_path: Path) -> Optional[int]:
+        """TDB2データベースのロック（tdb.lock）を保持している生存プロセスのPIDを返す"""
+        lock_path = tdb_path / "tdb.lock"
+        try:
+            pid = int(lock_path.read_text().strip())
+        except (OSError, ValueError):
+            return None
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return None  # 異常終了したプロセスが残したロック
+        except PermissionError:
+            pass  # 他ユーザーのプロセスが生存している
+        return pid
+
+    def bulk_load(
+        self,
+        file_path: str,
+        tdb_path: str,
+        replace: bool = False
+    ) -> Dict[str, Any]:
+        """
+        tdb2.tdbloader でRDFファイルをTDB2データベースに直接ロード
+
+        HTTP経由の逐次登録を避けてバルクローダーで書き込む。
+        Fusekiがデータベースを開いている間は書き込めないため、
+        Fusekiを停止した状態で、同じマシンから実行する必要がある。
+        ロード後にFusekiを起動するとデータが反映される。
+
+        Args:
+            file_path: ロードするRDFファイルのパス
+            tdb_path: データセットのTDB2データベースディレクトリ
+            replace: Trueの場合、新しいデータベースにロードしてから既存のものと入れ替える
+                （ロードに失敗した場合は既存のデータベースをそのまま残す）
+
+        Returns:
+            ロード結果の辞書
+        """
+        file_path = Path(file_path)
+        if not file_path.exists():
+            return {
+                "success": False,
+                "error": f"ファイルが見つかりません: {file_path}"
+            }
+
+        loader = shutil.which("tdb2.tdbloader")
+        if loader is None:
+            return {"success": False, "error": "tdb2.tdbloader が見つかりません"}
+        if not tdb_path or not Path(tdb_path).is_dir():
+            return {"success": False, "error": f"TDB2データベースが見つかりません: {tdb_path}"}
+        tdb_path = Path(tdb_path)
+
+        # Fusekiが起動中、または他のプロセスがデータベースを開いている場合は書き込まない
+        if self.check_connection():
+            return {"success": False, "error": "Fusekiサーバーが起動中です（停止してから実行してください）"}
+        owner = self._tdb_lock_owner(tdb_path)
+        if owner is not None:
+            return {"success": False, "error": f"TDB2データベースがロックされています (PID {owner})"}
+
+        # 置換時は別ディレクトリにロードし、成功してから入れ替える
+        target = tdb_path.with_name(tdb_path.name + ".loading") if replace else tdb_path
+        if replace:
+            shutil.rmtree(target, ignore_errors=True)
+
+        try:
+            completed = subprocess.run(
+                [loader, "--loc", str(target), str(file_path)],
+                capture_output=True,
+                text=True,
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            if replace:
+                shutil.rmtree(target, ignore_errors=True)
+            self.logger.error(f"バルクロード失敗: {e}")
+            return {"success": False, "error": str(e)}
+
+        if completed.returncode != 0:
+            if replace:
+                shutil.rmtree(target, ignore_errors=True)
+            self.logger.error(f"バルクロード失敗: {completed.stderr}")
+            return {"success": False, "error": completed.stderr.strip()}
+
+        if replace:
+            backup = tdb_path.with_name(tdb_path.name + ".old")
+            try:
+                shutil.rmtree(backup, ignore_errors=True)
+                os.rename(tdb_path, backup)
+                try:
+                    os.rename(target, tdb_path)
+                except OSError:
+                    os.rename(backup, tdb_path)  # 既存のデータベースを元に戻す
+                    raise
+            except OSError as e:
+                shutil.rmtree(target, ignore_errors=True)
+                self.logger.error(f"データベースの入れ替えに失敗: {e}")
+                return {"success": False, "error": f"データベースの入れ替えに失敗: {e}"}
+            shutil.rmtree(backup, ignore_errors=True)
+
+        self.logger.info(f"バルクロード成功: {file_path}")
+        return {
+            "success": True,
+            "message": f"バルクロード成功: {file_path.name}",
+            "location": str(tdb_path),
+        }
+
     def upload_data(
         self,
         data: str,
@@ -152,11 +313,11 @@ class FusekiUploader:
         try:
             headers = {"Content-Type": content_type}
             if method == "PUT":
-                response = requests.put(
+                response = self.session.put(
                     url, data=data.encode("utf-8"), headers=headers, timeout=60
                 )
             else:
-                response = requests.post(
+                response = self.session.post(
                     url, data=data.encode("utf-8"), headers=headers, timeout=60
                 )
 
@@ -180,6 +341,99 @@ class FusekiUploader:
                 "error": str(e),
             }
 
+    def upload_delta(
+        self,
+        old_path: str,
+        new_path: str,
+        graph_uri: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        前回のRDFスナップショットとの差分のみをSPARQL Updateで反映
+
+        削除と追加は1つのリクエスト（DELETE DATA ...; INSERT DATA ...）として送るため、
+        途中で失敗しても部分的に反映された状態にはならない。
+        前回ファイルが存在しない場合、差分に空白ノードが含まれる場合、
+        差分の反映に失敗した場合はnew_pathを置換アップロードする。
+
+        Args:
+            old_path: 前回アップロードしたRDFファイルのパス
+            new_path: 今回のRDFファイルのパス
+            graph_uri: 名前付きグラフのURI（Noneの場合はデフォルトグラフ）
+
+        Returns:
+            アップロード結果の辞書
+        """
+        old_path = Path(old_path)
+        new_path = Path(new_path)
+        if not new_path.exists():
+            return {
+                "success": False,
+                "error": f"ファイルが見つかりません: {new_path}"
+            }
+        if not old_path.exists():
+            self.logger.info("前回スナップショットなし: 全体をアップロードします")
+            return self.upload_file(str(new_path), graph_uri=graph_uri, replace=True)
+
+        old_graph = Graph().parse(str(old_path))
+        new_graph = Graph().parse(str(new_path))
+        removed = old_graph - new_graph
+        added = new_graph - old_graph
+
+        # DELETE DATAは空白ノードを扱えないため全体置換にフォールバック
+        if any(
+            isinstance(term, BNode)
+            for graph in (removed, added)
+            for triple in graph
+            for term in triple
+        ):
+            self.logger.info("差分に空白ノードを含むため全体をアップロードします")
+            return self.upload_file(str(new_path), graph_uri=graph_uri, replace=True)
+
+        operations = [
+            self._build_data_update(operation, list(triples), graph_uri)
+            for operation, triples in (("DELETE", removed), ("INSERT", added))
+            if len(triples)
+        ]
+        if operations:
+            try:
+                response = self.session.post(
+                    self.update_endpoint,
+                    data={"update": " ;\n".join(operations)},
+                    timeout=60
+                )
+                error = None if response.status_code in (200, 204) else (
+                    f"{response.status_code} - {response.text}"
+                )
+            except requests.RequestException as e:
+                error = str(e)
+
+            if error is not None:
+                self.logger.error(f"差分アップロード失敗: {error} → 全体をアップロードします")
+                return self.upload_file(str(new_path), graph_uri=graph_uri, replace=True)
+
+        self.logger.info(f"差分アップロード成功: +{len(added)} / -{len(removed)}")
+        return {
+            "success": True,
+            "message": f"差分アップロード成功: {new_path.name}",
+            "inserted": len(added),
+            "deleted": len(removed),
+            "endpoint": self.update_endpoint,
+        }
+
+    @staticmethod
+    def _build_data_update(
+        operation: str,
+        triples: List[Tuple],
+        graph_uri: Optional[str] = None
+    ) -> str:
+        """INSERT DATA / DELETE DATA のSPARQL Updateを組み立て"""
+        body = "\n".join(
+            f"{s.n3()} {p.n3()} {o.n3()} ." for s, p, o in triples
+        )
+        if graph_uri:
+            body = f"GRAPH <{graph_uri}> {{\n{body}\n}}"
+        return f"{operation} DATA {{\n{body}\n}}"
+
     def clear_graph(self, graph_uri: Optional[str] = None) -> Dict[str, Any]:
         """
         グラフのデータをクリア
@@ -196,7 +450,7 @@ class FusekiUploader:
             sparql = "CLEAR DEFAULT"
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 self.update_endpoint,
                 data={"update": sparql},
                 timeout=30
@@ -231,7 +485,7 @@ class FusekiUploader:
             sparql = "SELECT (COUNT(*) AS ?count) WHERE { ?s ?p ?o }"
 
         try:
-            response = requests.get(
+            response = self.session.get(
                 self.query_endpoint,
                 params={"query": sparql},
                 headers={"Accept": "application/sparql-results+json"},
@@ -255,23 +509,31 @@ class FusekiUploader:
         Returns:
             統計情報の辞書
         """
-        triple_count = self.get_triple_count()
-
-        # クラス別のインスタンス数を取得
-        class_count_sparql = """
-        SELECT ?class (COUNT(?s) AS ?count)
+        # 総トリプル数とクラス別インスタンス数を1回のクエリで取得
+        # （?class が束縛されない行が総トリプル数）
+        stats_sparql = """
+        SELECT ?class ?count
         WHERE {
-            ?s a ?class .
+            {
+                SELECT (COUNT(*) AS ?count)
+                WHERE { ?s ?p ?o }
+            }
+            UNION
+            {
+                SELECT ?class (COUNT(?s) AS ?count)
+                WHERE { ?s a ?class . }
+                GROUP BY ?class
+            }
         }
-        GROUP BY ?class
         ORDER BY DESC(?count)
         """
 
+        triple_count = -1
         class_counts = {}
         try:
-            response = requests.get(
+            response = self.session.get(
                 self.query_endpoint,
-                params={"query": class_count_sparql},
+                params={"query": stats_sparql},
                 headers={"Accept": "application/sparql-results+json"},
                 timeout=30
             )
@@ -279,8 +541,11 @@ class FusekiUploader:
             if response.status_code == 200:
                 result = response.json()
                 for binding in result["results"]["bindings"]:
-                    class_uri = binding["class"]["value"]
                     count = int(binding["count"]["value"])
+                    if "class" not in binding:
+                        triple_count = count
+                        continue
+                    class_uri = binding["class"]["value"]
                     # URIからローカル名を抽出
                     local_name = class_uri.split("#")[-1].split("/")[-1]
                     class_counts[local_name] = count
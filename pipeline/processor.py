@@ -6,7 +6,10 @@
 
 import json
 import logging
-from typing import List, Dict, Any, Optional
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Iterable, Iterator
 from pathlib import Path
 from datetime import datetime
 
@@ -14,20 +17,121 @@ from extractors import EntityExtractor, StatementExtractor, ExtractionResult
 from .rdf_generator import RDFGenerator
 from .validator import SHACLValidator
 
+try:
+    import orjson
+except ImportError:  # orjson未導入時は標準jsonを使用
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson未導入時はファイル全体を読み込む
+    ijson = None
+
+
+def extract_article(
+    article: Dict,
+    entity_extractor: EntityExtractor,
+    statement_extractor: StatementExtractor,
+) -> ExtractionResult:
+    """
+    単一の記事からエンティティとStatementを抽出
+
+    Args:
+        article: 記事辞書
+        entity_extractor: エンティティ抽出器
+        statement_extractor: Statement抽出器
+
+    Returns:
+        ExtractionResult
+    """
+    # タイトル・要約・本文の結合と辞書スキャンは1回だけ行い、
+    # エンティティ抽出とStatement抽出で共有する
+    combined_text = entity_extractor.build_article_text(article)
+    all_entities = entity_extractor.extract(combined_text)
+
+    # エンティティ抽出
+    entities = entity_extractor.unique_entities(all_entities)
+
+    # Statement抽出
+    statements = statement_extractor.extract(
+        combined_text, article.get("id", "unknown"), entities=all_entities
+    )
+
+    # 抽出結果を構築
+    return ExtractionResult(
+        article_id=article.get("id", "unknown"),
+        article_title=article.get("title", ""),
+        article_url=article.get("url", ""),
+        article_pub_date=article.get("pubDate", ""),
+        entities=entities,
+        statements=statements,
+    )
+
+
+# ワーカープロセスごとの抽出器（_init_worker で初期化）
+_worker_entity_extractor: Optional[EntityExtractor] = None
+_worker_statement_extractor: Optional[StatementExtractor] = None
+
+
+def _init_worker():
+    """ワーカープロセスで抽出器を初期化"""
+    global _worker_entity_extractor, _worker_statement_extractor
+    _worker_entity_extractor = EntityExtractor()
+    _worker_statement_extractor = StatementExtractor(_worker_entity_extractor)
+
+
+def _process_article(article: Dict) -> ExtractionResult:
+    """ワーカープロセスで単一の記事を処理"""
+    return extract_article(
+        article, _worker_entity_extractor, _worker_statement_extractor
+    )
+
+
+def copy_file_atomic(src: Path, dst: Path):
+    """
+    ファイルを一時ファイル経由でコピーし、置換をアトミックに行う
+
+    Args:
+        src: コピー元
+        dst: コピー先（存在する場合は置換）
+    """
+    tmp_path = dst.with_name(dst.name + ".tmp")
+    shutil.copyfile(src, tmp_path)
+    os.replace(tmp_path, dst)
+
 
 class PipelineProcessor:
     """パイプライン処理を行うクラス"""
 
-    def __init__(self, validate: bool = True):
+    def __init__(
+        self,
+        validate: bool = True,
+        parallel: bool = False,
+        max_workers: Optional[int] = None,
+        validation_workers: Optional[int] = 1,
+        validation_cache: bool = False,
+    ):
         """
         Args:
             validate: SHACL検証を行うかどうか
+            parallel: 記事の抽出をプロセスプールで並列実行するかどうか
+                （デバッグ時の再現性のためデフォルトは逐次実行）
+            max_workers: 並列実行時のワーカー数（Noneの場合はCPU数）
+            validation_workers: SHACL検証のワーカープロセス数
+                （1の場合は逐次検証。Noneの場合はCPU数。
+                互いに参照しないシェイプのまとまりが1つだけなら逐次検証する）
+            validation_cache: 同じ出力・シェイプの検証結果をディスクから再利用するかどうか
         """
         self.entity_extractor = EntityExtractor()
         self.statement_extractor = StatementExtractor(self.entity_extractor)
         self.rdf_generator = RDFGenerator()
-        self.validator = SHACLValidator() if validate else None
+        # 最後に保存したRDF（Turtle）のバイト列
+        self.rdf_bytes: Optional[bytes] = None
+        self.validator = SHACLValidator.shared(use_cache=validation_cache) if validate else None
         self.validate_output = validate
+        self.parallel = parallel
+        self.max_workers = max_workers
+        self.validation_workers = validation_workers
 
         # 処理統計
         self.stats = {
@@ -52,13 +156,36 @@ class PipelineProcessor:
         Returns:
             記事リスト
         """
-        with open(input_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        if orjson is not None:
+            with open(input_path, 'rb') as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(input_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
 
         articles = data.get("articles", [])
         self.logger.info(f"{len(articles)}件の記事を読み込みました")
         return articles
 
+    def iter_articles(self, input_path: str) -> Iterator[Dict]:
+        """
+        記事データを1件ずつ読み込み
+
+        ijsonが使える場合はファイル全体を展開せずにストリーム解析する。
+
+        Args:
+            input_path: articles.jsonのパス
+
+        Yields:
+            記事辞書
+        """
+        if ijson is None:
+            yield from self.load_articles(input_path)
+            return
+
+        with open(input_path, 'rb') as f:
+            yield from ijson.items(f, 'articles.item', use_float=True)
+
     def process_article(self, article: Dict) -> ExtractionResult:
         """
         単一の記事を処理
@@ -69,56 +196,65 @@ class PipelineProcessor:
         Returns:
             ExtractionResult
         """
-        # エンティティ抽出
-        entities = self.entity_extractor.extract_from_article(article)
-
-        # Statement抽出
-        statements = self.statement_extractor.extract_from_article(article)
-
-        # 抽出結果を構築
-        result = ExtractionResult(
-            article_id=article.get("id", "unknown"),
-            article_title=article.get("title", ""),
-            article_url=article.get("url", ""),
-            article_pub_date=article.get("pubDate", ""),
-            entities=entities,
-            statements=statements,
+        return extract_article(
+            article, self.entity_extractor, self.statement_extractor
         )
 
-        return result
-
     def process_all(
-        self, articles: List[Dict], progress_callback=None
+        self, articles: Iterable[Dict], progress_callback=None
     ) -> List[ExtractionResult]:
         """
         全記事を処理
 
+        parallel=True の場合、抽出はプロセスプールで並列に行い、
+        統計とRDFグラフへの追加はメインプロセスで記事順に行います。
+
         Args:
-            articles: 記事リスト
-            progress_callback: 進捗コールバック関数
+            articles: 記事リストまたは記事のイテラブル
+            progress_callback: 進捗コールバック関数（総数が不明な場合 total は None）
 
         Returns:
             ExtractionResultのリスト
         """
         results = []
-        total = len(articles)
-
-        for i, article in enumerate(articles):
-            result = self.process_article(article)
-            results.append(result)
+        total = len(articles) if hasattr(articles, "__len__") else None
+
+        if self.parallel and (total is None or total > 1):
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers, initializer=_init_worker
+            ) as executor:
+                for i, result in enumerate(
+                    executor.map(_process_article, articles, chunksize=16)
+                ):
+                    self._collect_result(i, total, result, results, progress_callback)
+        else:
+            for i, article in enumerate(articles):
+                result = self.process_article(article)
+                self._collect_result(i, total, result, results, progress_callback)
+
+        self.stats["total_articles"] = len(results)
+        return results
 
-            # 統計更新
-            self._update_stats(result)
+    def _collect_result(
+        self,
+        index: int,
+        total: int,
+        result: ExtractionResult,
+        results: List[ExtractionResult],
+        progress_callback=None,
+    ):
+        """抽出結果を集約（統計更新・RDF追加・進捗通知）"""
+        results.append(result)
 
-            # RDFグラフに追加
-            self.rdf_generator.add_extraction_result(result)
+        # 統計更新
+        self._update_stats(result)
 
-            # 進捗通知
-            if progress_callback:
-                progress_callback(i + 1, total, result)
+        # RDFグラフに追加
+        self.rdf_generator.add_extraction_result(result)
 
-        self.stats["total_articles"] = total
-        return results
+        # 進捗通知
+        if progress_callback:
+            progress_callback(index + 1, total, result)
 
     def _update_stats(self, result: ExtractionResult):
         """統計情報を更新"""
@@ -155,19 +291,26 @@ class PipelineProcessor:
         # タイムスタンプ
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-        # RDFファイルを保存
+        # RDFを1回だけシリアライズし、バイト列をファイル保存とアップロードで共有
         rdf_path = output_dir / f"knowledge_graph_{timestamp}.ttl"
-        self.rdf_generator.save(str(rdf_path), format="turtle")
+        self.rdf_bytes = self.rdf_generator.graph.serialize(format="turtle", encoding="utf-8")
+        rdf_path.write_bytes(self.rdf_bytes)
         self.logger.info(f"RDFを保存: {rdf_path}")
 
-        # 最新版としてもコピー
+        # 最新版としても保存（同じバイト列を一時ファイル経由で置き換える）
         latest_path = output_dir / "knowledge_graph.ttl"
-        self.rdf_generator.save(str(latest_path), format="turtle")
+        tmp_path = latest_path.with_name(latest_path.name + ".tmp")
+        tmp_path.write_bytes(self.rdf_bytes)
+        os.replace(tmp_path, latest_path)
 
         # 統計情報を保存
         stats_path = output_dir / f"stats_{timestamp}.json"
-        with open(stats_path, 'w', encoding='utf-8') as f:
-            json.dump(self.stats, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            with open(stats_path, 'wb') as f:
+                f.write(orjson.dumps(self.stats, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            with open(stats_path, 'w', encoding='utf-8') as f:
+                json.dump(self.stats, f, ensure_ascii=False, indent=2)
         self.logger.info(f"統計情報を保存: {stats_path}")
 
         return {
@@ -176,12 +319,13 @@ class PipelineProcessor:
             "stats": str(stats_path),
         }
 
-    def validate_output_file(self, rdf_path: str) -> Dict[str, Any]:
+    def validate_output_file(self, rdf_path_or_graph) -> Dict[str, Any]:
         """
-        出力ファイルをSHACL検証
+        出力をSHACL検証
 
         Args:
-            rdf_path: RDFファイルのパス
+            rdf_path_or_graph: RDFファイルのパス、または生成済みのGraph
+                （Graphを渡すと保存したファイルを再パースしない）
 
         Returns:
             検証結果の辞書
@@ -189,7 +333,12 @@ class PipelineProcessor:
         if not self.validator:
             return {"conforms": True, "message": "検証スキップ"}
 
-        conforms, report = self.validator.validate_file(rdf_path)
+        if self.validation_workers == 1:
+            conforms, report, _ = self.validator.validate(rdf_path_or_graph)
+        else:
+            conforms, report, _ = self.validator.validate_parallel(
+                rdf_path_or_graph, n_workers=self.validation_workers
+            )
         return {
             "conforms": conforms,
             "message": "データは全ての制約に適合しています" if conforms else report,
@@ -219,20 +368,22 @@ class PipelineProcessor:
         self.logger.info("パイプライン開始")
         start_time = datetime.now()
 
-        # 記事読み込み
-        articles = self.load_articles(input_path)
+        # 記事読み込み（ストリーム解析しながら処理する）
+        articles = self.iter_articles(input_path)
 
         # 処理実行
         def progress_callback(current, total, result):
             if verbose and current % 50 == 0:
-                self.logger.info(f"処理中: {current}/{total}")
+                self.logger.info(f"処理中: {current}/{total or '?'}")
 
         results = self.process_all(articles, progress_callback)
+        self.logger.info(f"{len(results)}件の記事を処理しました")
 
         # 出力保存
         output_files = self.save_output(output_dir)
 
-        # 検証
+        # 検証（保存したTurtleを検証する。メモリ上のグラフは decimal リテラルの
+        # 値表現がパース後と異なり、SHACLのデータ型判定が変わるため使わない）
         validation_result = {"conforms": True, "message": "検証スキップ"}
         if self.validate_output:
             validation_result = self.validate_output_file(output_files["rdf_latest"])
@@ -252,4 +403,6 @@ class PipelineProcessor:
             "stats": self.stats,
             "output_files": output_files,
             "validation": validation_result,
+            # 保存したTurtleのバイト列（アップロードでファイルを読み直さずに送信できる）
+            "rdf_bytes": self.rdf_bytes,
         }
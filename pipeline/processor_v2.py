@@ -4,9 +4,15 @@
 LLMを使ったトリプル抽出パイプラインを制御します。
 """
 
+import os
+import time
 import json
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+import httpx
+from collections import Counter
+from itertools import islice
+from typing import List, Dict, Any, Optional, Iterable, Iterator
 from pathlib import Path
 from datetime import datetime
 
@@ -14,18 +20,56 @@ from extractors.llm_extractor import LLMTripleExtractor, ExtractionResult, get_e
 from extractors.predicate_normalizer import PredicateBatchNormalizer, get_normalizer
 from extractors.entity_resolver import EntityResolver, get_resolver
 from .rdf_generator_v2 import TripleBasedRDFGenerator
+from .processor import copy_file_atomic
+
+try:
+    import orjson
+except ImportError:  # orjson未導入時は標準jsonを使用
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson未導入時はファイル全体を読み込む
+    ijson = None
 
 
 class TriplePipelineProcessor:
     """トリプルベースのパイプライン処理を行うクラス"""
 
+    # 進捗ログを出力する間隔（記事数）
+    LOG_EVERY = 10
+
+    # 記事を読み込んで抽出する単位（記事数。入力全体をメモリに展開しない）
+    EXTRACT_WINDOW = 256
+
+    # 統計に出力するエンティティタイプ
+    ENTITY_TYPES = ("person", "organization", "place", "other")
+
     def __init__(
         self,
         extractor: LLMTripleExtractor = None,
         normalize_predicates: bool = True,
-        reasoning: bool = True
+        reasoning: bool = True,
+        concurrency: Optional[int] = None,
+        articles_per_request: int = 1,
+        rdf_workers: Optional[int] = 1
     ):
+        """
+        Args:
+            extractor: トリプル抽出器
+            normalize_predicates: 述語をバッチ正規化するか
+            reasoning: 推論モードを有効化
+            concurrency: LLMへの同時リクエスト数（未指定なら環境変数 NEWSKG_LLM_CONCURRENCY、1で逐次処理）
+            articles_per_request: 1回のLLMリクエストにまとめる記事数（1で記事ごと）
+            rdf_workers: RDF組み立て時のエンティティ解決のワーカープロセス数
+                （1で記事ごとに逐次、Noneまたは2以上で全記事分をまとめて並列解決）
+        """
         self.extractor = extractor or LLMTripleExtractor(reasoning=reasoning)
+        if concurrency is None:
+            concurrency = int(os.getenv("NEWSKG_LLM_CONCURRENCY", "8"))
+        self.concurrency = max(1, concurrency)
+        self.articles_per_request = max(1, articles_per_request)
+        self.rdf_workers = rdf_workers
         self.entity_resolver = get_resolver()
         self.predicate_normalizer = get_normalizer()
         self.rdf_generator = TripleBasedRDFGenerator(
@@ -40,7 +84,8 @@ class TriplePipelineProcessor:
             "articles_with_triples": 0,
             "total_triples": 0,
             "unique_predicates": set(),
-            "entity_types": {"person": 0, "organization": 0, "place": 0, "other": 0},
+            # 未知のタイプも数え、出力時に ENTITY_TYPES に絞り込む
+            "entity_types": Counter(),
         }
 
         # ロガー設定
@@ -56,13 +101,36 @@ class TriplePipelineProcessor:
         Returns:
             記事リスト
         """
-        with open(input_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        if orjson is not None:
+            with open(input_path, 'rb') as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(input_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
 
         articles = data.get("articles", [])
         self.logger.info(f"{len(articles)}件の記事を読み込みました")
         return articles
 
+    def iter_articles(self, input_path: str) -> Iterator[Dict]:
+        """
+        記事データを1件ずつ読み込み
+
+        ijsonが使える場合はファイル全体を展開せずにストリーム解析する。
+
+        Args:
+            input_path: articles.jsonのパス
+
+        Yields:
+            記事辞書
+        """
+        if ijson is None:
+            yield from self.load_articles(input_path)
+            return
+
+        with open(input_path, 'rb') as f:
+            yield from ijson.items(f, 'articles.item', use_float=True)
+
     def process_article(self, article: Dict) -> ExtractionResult:
         """
         単一の記事を処理
@@ -75,54 +143,171 @@ class TriplePipelineProcessor:
         """
         return self.extractor.extract_from_article(article)
 
-    def process_all(
+    def process_article_batch(self, articles: List[Dict]) -> List[ExtractionResult]:
+        """
+        複数の記事を1回のLLMリクエストで処理
+
+        Args:
+            articles: 記事リスト
+
+        Returns:
+            記事順のExtractionResultのリスト
+        """
+        return self.extractor.extract_from_articles(articles)
+
+    def _chunk_articles(self, articles: List[Dict]) -> List[List[Dict]]:
+        """記事を articles_per_request 件ずつのバッチに分割"""
+        iterator = iter(articles)
+        batches = []
+        while batch := list(islice(iterator, self.articles_per_request)):
+            batches.append(batch)
+        return batches
+
+    async def _process_batch_async(
         self,
         articles: List[Dict],
+        sem: asyncio.Semaphore,
+        http_client: httpx.AsyncClient
+    ) -> List[ExtractionResult]:
+        """複数の記事を1リクエストで非同期に処理（セマフォで同時実行数を制限）"""
+        async with sem:
+            return await self.extractor.extract_from_articles_async(
+                articles, http_client=http_client
+            )
+
+    async def _extract_batches_async(self, batches: List[List[Dict]]) -> list:
+        """全バッチのLLM抽出を並行して実行（例外は結果として返す）"""
+        sem = asyncio.Semaphore(self.concurrency)
+        async with httpx.AsyncClient(timeout=self.extractor.client.timeout) as http_client:
+            tasks = [
+                self._process_batch_async(batch, sem, http_client)
+                for batch in batches
+            ]
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _extract_batched(self, articles: List[Dict]) -> list:
+        """記事をバッチにまとめて抽出し、記事順の結果（または例外）のリストを返す"""
+        batches = self._chunk_articles(articles)
+        if self.concurrency > 1 and len(batches) > 1:
+            batch_results = asyncio.run(self._extract_batches_async(batches))
+        else:
+            batch_results = [self.process_article_batch(batch) for batch in batches]
+
+        extracted = []
+        for batch, batch_result in zip(batches, batch_results):
+            if isinstance(batch_result, BaseException):
+                extracted.extend([batch_result] * len(batch))
+            else:
+                extracted.extend(batch_result)
+        return extracted
+
+    async def _process_article_async(
+        self,
+        article: Dict,
+        sem: asyncio.Semaphore,
+        http_client: httpx.AsyncClient
+    ) -> ExtractionResult:
+        """単一の記事を非同期に処理（セマフォで同時実行数を制限）"""
+        async with sem:
+            return await self.extractor.extract_from_article_async(
+                article, http_client=http_client
+            )
+
+    async def _extract_all_async(self, articles: List[Dict]) -> list:
+        """全記事のLLM抽出を並行して実行（例外は結果として返す）"""
+        sem = asyncio.Semaphore(self.concurrency)
+        async with httpx.AsyncClient(timeout=self.extractor.client.timeout) as http_client:
+            tasks = [
+                self._process_article_async(article, sem, http_client)
+                for article in articles
+            ]
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+    def process_all(
+        self,
+        articles: Iterable[Dict],
         progress_callback: Optional[callable] = None,
         max_articles: Optional[int] = None
     ) -> List[ExtractionResult]:
         """
         全記事を処理
 
+        concurrency > 1 の場合、LLM抽出を asyncio で並行実行し、
+        統計更新とRDFグラフへの追加は記事順に逐次行います。
+        articles_per_request > 1 の場合、複数記事を1リクエストにまとめて抽出します。
+        記事は EXTRACT_WINDOW 件ずつ読み込んで処理するため、
+        ストリーム入力の全記事を同時にメモリに保持しません。
+
         Args:
-            articles: 記事リスト
+            articles: 記事リストまたは記事のイテラブル
             progress_callback: 進捗コールバック関数 (current, total, result)
+                （総数が不明な場合 total は None）
             max_articles: 処理する最大記事数（デバッグ用）
 
         Returns:
             ExtractionResultのリスト
         """
         results = []
-        
+        total = len(articles) if hasattr(articles, "__len__") else None
+
+        # ストリーム入力は max_articles 件で読み込みを打ち切る
         if max_articles:
-            articles = articles[:max_articles]
-        
-        total = len(articles)
-
-        for i, article in enumerate(articles):
-            try:
-                result = self.process_article(article)
-                results.append(result)
-
-                # 統計更新
-                self._update_stats(result)
-
-                # RDFグラフに追加
-                self.rdf_generator.add_extraction_result(result, article)
-
-                # 進捗通知
-                if progress_callback:
-                    progress_callback(i + 1, total, result)
-
-                self.logger.info(
-                    f"[{i+1}/{total}] {article.get('title', '')[:40]}... -> {len(result.triples)} triples"
-                )
-                
-            except Exception as e:
-                self.logger.error(f"記事処理エラー [{article.get('id')}]: {e}")
-                continue
-
-        self.stats["total_articles"] = total
+            articles = islice(articles, max_articles)
+            if total is not None:
+                total = min(total, max_articles)
+        iterator = iter(articles)
+
+        pending_rdf = []
+        log_progress = self.logger.isEnabledFor(logging.INFO)
+        count = 0
+        while window := list(islice(iterator, self.EXTRACT_WINDOW)):
+            extracted = None
+            if self.articles_per_request > 1:
+                extracted = self._extract_batched(window)
+            elif self.concurrency > 1 and len(window) > 1:
+                extracted = asyncio.run(self._extract_all_async(window))
+
+            for i, article in enumerate(window, count):
+                try:
+                    if extracted is None:
+                        result = self.process_article(article)
+                    else:
+                        result = extracted[i - count]
+                        if isinstance(result, BaseException):
+                            raise result
+                    results.append(result)
+
+                    # 統計更新
+                    self._update_stats(result)
+
+                    # RDFグラフに追加（並列解決時は全記事分をまとめて後で追加）
+                    if self.rdf_workers == 1:
+                        self.rdf_generator.add_extraction_result(result, article)
+                    else:
+                        pending_rdf.append((result, article))
+
+                    # 進捗通知
+                    if progress_callback:
+                        progress_callback(i + 1, total, result)
+
+                    # 進捗ログ（LOG_EVERY件ごとと、総数が分かる場合は最後の1件、遅延フォーマット）
+                    if log_progress and ((i + 1) % self.LOG_EVERY == 0 or i + 1 == total):
+                        self.logger.info(
+                            "[%d/%s] %.40s... -> %d triples",
+                            i + 1, total if total is not None else "?",
+                            article.get('title', ''), len(result.triples)
+                        )
+
+                except Exception as e:
+                    self.logger.error(f"記事処理エラー [{article.get('id')}]: {e}")
+                    continue
+
+            count += len(window)
+
+        if pending_rdf:
+            self.rdf_generator.add_extraction_results(pending_rdf, max_workers=self.rdf_workers)
+
+        self.stats["total_articles"] = count
         return results
 
     def _update_stats(self, result: ExtractionResult):
@@ -133,13 +318,23 @@ class TriplePipelineProcessor:
         self.stats["total_triples"] += len(result.triples)
 
         # 述語を収集
+        unique_predicates = self.stats["unique_predicates"]
+        entity_types = self.stats["entity_types"]
         for triple in result.triples:
-            self.stats["unique_predicates"].add(triple.predicate)
+            unique_predicates.add(triple.predicate)
             
             # エンティティタイプ別カウント
-            for entity_type in [triple.subject_type, triple.object_type]:
-                if entity_type in self.stats["entity_types"]:
-                    self.stats["entity_types"][entity_type] += 1
+            entity_types[triple.subject_type] += 1
+            entity_types[triple.object_type] += 1
+
+    def _stats_for_output(self) -> Dict[str, Any]:
+        """出力用の統計情報（集合はリストに、エンティティタイプは既知のものに絞る）"""
+        entity_types = self.stats["entity_types"]
+        return {
+            **self.stats,
+            "unique_predicates": list(self.stats["unique_predicates"]),
+            "entity_types": {t: entity_types[t] for t in self.ENTITY_TYPES},
+        }
 
     def normalize_all_predicates(self, results: List[ExtractionResult]):
         """
@@ -151,20 +346,21 @@ class TriplePipelineProcessor:
         if not self.normalize_predicates:
             return
 
-        # 全述語を収集
-        all_predicates = []
-        for result in results:
-            for triple in result.triples:
-                all_predicates.append(triple.predicate)
+        # 全述語を重複なく収集（出現回数はLLMへの提示用に保持）
+        pred_counts = Counter(
+            triple.predicate for result in results for triple in result.triples
+        )
 
-        if not all_predicates:
+        if not pred_counts:
             return
 
-        self.logger.info(f"述語の正規化を開始: {len(set(all_predicates))}種類")
+        self.logger.info(f"述語の正規化を開始: {len(pred_counts)}種類")
 
         # バッチ正規化
-        batch_normalizer = PredicateBatchNormalizer(normalizer=self.predicate_normalizer)
-        mapping = batch_normalizer.normalize_batch(all_predicates)
+        batch_normalizer = PredicateBatchNormalizer(
+            normalizer=self.predicate_normalizer, concurrency=self.concurrency
+        )
+        mapping = batch_normalizer.normalize_batch(list(pred_counts), counts=pred_counts)
 
         self.logger.info(f"述語の正規化完了: {len(mapping)}件のマッピング")
 
@@ -189,19 +385,23 @@ class TriplePipelineProcessor:
         self.rdf_generator.save(str(rdf_path), format="turtle")
         self.logger.info(f"RDFを保存: {rdf_path}")
 
-        # 最新版としてもコピー
+        # 最新版としてもコピー（再シリアライズせずファイルを複製）
         latest_path = output_dir / "knowledge_graph_v2.ttl"
-        self.rdf_generator.save(str(latest_path), format="turtle")
+        copy_file_atomic(rdf_path, latest_path)
 
         # 統計情報を保存
         stats_to_save = {
-            **self.stats,
-            "unique_predicates": list(self.stats["unique_predicates"]),
+            **self._stats_for_output(),
             "rdf_stats": self.rdf_generator.get_statistics()
         }
         stats_path = output_dir / f"stats_v2_{timestamp}.json"
-        with open(stats_path, 'w', encoding='utf-8') as f:
-            json.dump(stats_to_save, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            stats_path.write_bytes(orjson.dumps(
+                stats_to_save, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            ))
+        else:
+            with open(stats_path, 'w', encoding='utf-8') as f:
+                json.dump(stats_to_save, f, ensure_ascii=False, indent=2)
         self.logger.info(f"統計情報を保存: {stats_path}")
 
         return {
@@ -237,17 +437,13 @@ class TriplePipelineProcessor:
             )
 
         self.logger.info("トリプル抽出パイプライン開始")
-        start_time = datetime.now()
-
-        # 記事読み込み
-        articles = self.load_articles(input_path)
+        start_time = time.monotonic()
 
-        # 処理実行
-        def progress_callback(current, total, result):
-            if verbose and current % 10 == 0:
-                self.logger.info(f"処理中: {current}/{total}")
+        # 記事読み込み（ストリーム解析）
+        articles = self.iter_articles(input_path)
 
-        results = self.process_all(articles, progress_callback, max_articles)
+        # 処理実行（進捗は process_all 内で間引いてログ出力される）
+        results = self.process_all(articles, max_articles=max_articles)
 
         # 述語の正規化（バッチ）
         self.normalize_all_predicates(results)
@@ -256,7 +452,7 @@ class TriplePipelineProcessor:
         output_files = self.save_output(output_dir)
 
         # 実行時間
-        elapsed = (datetime.now() - start_time).total_seconds()
+        elapsed = time.monotonic() - start_time
 
         self.logger.info(f"パイプライン完了 ({elapsed:.2f}秒)")
         self.logger.info(f"  記事数: {self.stats['total_articles']}")
@@ -267,9 +463,6 @@ class TriplePipelineProcessor:
         return {
             "success": True,
             "elapsed_seconds": elapsed,
-            "stats": {
-                **self.stats,
-                "unique_predicates": list(self.stats["unique_predicates"])
-            },
+            "stats": self._stats_for_output(),
             "output_files": output_files,
         }
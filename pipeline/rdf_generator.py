@@ -4,7 +4,8 @@ RDF生成モジュール
 抽出結果をRDF（Turtle形式）に変換します。
 """
 
-from typing import List
+from itertools import repeat
+from typing import Dict, List, Tuple
 from pathlib import Path
 from datetime import datetime
 from rdflib import Graph, Namespace, Literal, URIRef, BNode
@@ -13,6 +14,15 @@ from rdflib.namespace import RDF, RDFS, XSD
 from extractors.base import Entity, Statement, ExtractionResult
 
 
+# N-Triples リテラルのエスケープ表
+_NT_ESCAPE = str.maketrans({
+    "\\": "\\\\",
+    '"': '\\"',
+    "\n": "\\n",
+    "\r": "\\r",
+})
+
+
 class RDFGenerator:
     """RDFグラフを生成するクラス"""
 
@@ -21,22 +31,97 @@ class RDFGenerator:
     DCT = Namespace("http://purl.org/dc/terms/")
     SCHEMA = Namespace("http://schema.org/")
 
+    # エンティティタイプ → クラス
+    ENTITY_CLASS_MAP = {
+        "organization": NEWSKG.Organization,
+        "person": NEWSKG.Person,
+        "place": NEWSKG.Place,
+    }
+
+    # Statementタイプ → クラス
+    STATEMENT_CLASS_MAP = {
+        "DissolutionAnnouncement": NEWSKG.DissolutionAnnouncement,
+        "ElectionResult": NEWSKG.ElectionResult,
+        "CandidateAnnouncement": NEWSKG.CandidateAnnouncement,
+        "ElectionSchedule": NEWSKG.ElectionStatement,
+        "EarthquakeEvent": NEWSKG.EarthquakeEvent,
+        "WeatherDisaster": NEWSKG.WeatherDisaster,
+        "EvacuationOrder": NEWSKG.EvacuationOrder,
+        "DamageReport": NEWSKG.DisasterStatement,
+        "PolicyAnnouncement": NEWSKG.PolicyAnnouncement,
+        "BudgetDecision": NEWSKG.BudgetDecision,
+        "LegislationEvent": NEWSKG.LegislationEvent,
+    }
+
     def __init__(self):
         """RDFGeneratorを初期化"""
-        self.graph = Graph()
+        self._graph = Graph()
         self.entity_cache = set()
+        self._ns_str = str(self.NEWSKG)
+        self._entity_uri_cache: Dict[Tuple[str, str], URIRef] = {}
+        self._reset_stats()
+        self._reset_buffer()
         self._bind_namespaces()
 
+    @property
+    def graph(self) -> Graph:
+        """RDFグラフ（バッファ済みのトリプルを反映してから返す）"""
+        self.flush()
+        return self._graph
+
     def _bind_namespaces(self):
         """名前空間をバインド"""
-        self.graph.bind("newskg", self.NEWSKG)
-        self.graph.bind("dct", self.DCT)
-        self.graph.bind("schema", self.SCHEMA)
+        self._graph.bind("newskg", self.NEWSKG)
+        self._graph.bind("dct", self.DCT)
+        self._graph.bind("schema", self.SCHEMA)
+
+    def _reset_buffer(self):
+        """トリプルバッファ（主語・述語・目的語の列）を初期化"""
+        self._subjects: List = []
+        self._predicates: List = []
+        self._objects: List = []
+
+    def _reset_stats(self):
+        """統計用の主語・述語・目的語の集合を初期化"""
+        self._subject_set: set = set()
+        self._predicate_set: set = set()
+        self._object_set: set = set()
+
+    def _add(self, triple):
+        """トリプルをバッファに追加（グラフへの反映は flush でまとめて行う）"""
+        s, p, o = triple
+        self._subjects.append(s)
+        self._predicates.append(p)
+        self._objects.append(o)
+
+    def flush(self):
+        """バッファ済みのトリプルを addN で一括してグラフに追加"""
+        if not self._subjects:
+            return
+        self._graph.addN(zip(
+            self._subjects, self._predicates, self._objects, repeat(self._graph)
+        ))
+        # 統計用の集合もまとめて更新（get_statistics でグラフを走査しない）
+        self._subject_set.update(self._subjects)
+        self._predicate_set.update(self._predicates)
+        self._object_set.update(self._objects)
+        self._reset_buffer()
+
+    def _entity_uri(self, entity: Entity) -> URIRef:
+        """エンティティのURIRefを取得（タイプとIDが同じなら同じオブジェクトを再利用）"""
+        key = (entity.entity_type, entity.id)
+        uri = self._entity_uri_cache.get(key)
+        if uri is None:
+            uri = self._entity_uri_cache[key] = URIRef(entity.to_uri(self._ns_str))
+        return uri
 
     def reset(self):
         """グラフをリセット"""
-        self.graph = Graph()
+        self._graph = Graph()
         self.entity_cache = set()
+        self._entity_uri_cache = {}
+        self._reset_stats()
+        self._reset_buffer()
         self._bind_namespaces()
 
     def add_article(self, article: dict) -> URIRef:
@@ -53,32 +138,32 @@ class RDFGenerator:
         article_uri = URIRef(f"{self.NEWSKG}article_{article_id}")
 
         # 型を追加
-        self.graph.add((article_uri, RDF.type, self.NEWSKG.NewsArticle))
+        self._add((article_uri, RDF.type, self.NEWSKG.NewsArticle))
 
         # プロパティを追加
         if "title" in article:
-            self.graph.add((
+            self._add((
                 article_uri,
                 self.NEWSKG.hasTitle,
                 Literal(article["title"], datatype=XSD.string)
             ))
 
         if "url" in article:
-            self.graph.add((
+            self._add((
                 article_uri,
                 self.NEWSKG.hasUrl,
                 Literal(article["url"], datatype=XSD.anyURI)
             ))
 
         if "pubDate" in article:
-            self.graph.add((
+            self._add((
                 article_uri,
                 self.NEWSKG.hasPubDate,
                 Literal(article["pubDate"], datatype=XSD.dateTime)
             ))
 
         if "content" in article:
-            self.graph.add((
+            self._add((
                 article_uri,
                 self.NEWSKG.hasContent,
                 Literal(article["content"], datatype=XSD.string)
@@ -96,7 +181,7 @@ class RDFGenerator:
         Returns:
             エンティティのURIRef
         """
-        entity_uri = URIRef(entity.to_uri(str(self.NEWSKG)))
+        entity_uri = self._entity_uri(entity)
 
         # 既に追加済みなら再利用
         if entity_uri in self.entity_cache:
@@ -105,16 +190,11 @@ class RDFGenerator:
         self.entity_cache.add(entity_uri)
 
         # エンティティタイプに応じたクラスを設定
-        type_class_map = {
-            "organization": self.NEWSKG.Organization,
-            "person": self.NEWSKG.Person,
-            "place": self.NEWSKG.Place,
-        }
-        entity_class = type_class_map.get(entity.entity_type, self.NEWSKG.Entity)
-        self.graph.add((entity_uri, RDF.type, entity_class))
+        entity_class = self.ENTITY_CLASS_MAP.get(entity.entity_type, self.NEWSKG.Entity)
+        self._add((entity_uri, RDF.type, entity_class))
 
         # ラベルを追加
-        self.graph.add((
+        self._add((
             entity_uri,
             self.NEWSKG.hasLabel,
             Literal(entity.label, lang="ja")
@@ -122,7 +202,7 @@ class RDFGenerator:
 
         # 別名（マッチしたテキストがラベルと異なる場合）
         if entity.matched_text != entity.label:
-            self.graph.add((
+            self._add((
                 entity_uri,
                 self.NEWSKG.hasAlias,
                 Literal(entity.matched_text, lang="ja")
@@ -131,7 +211,7 @@ class RDFGenerator:
         # 追加属性
         if entity.extra:
             if "role" in entity.extra and entity.extra["role"]:
-                self.graph.add((
+                self._add((
                     entity_uri,
                     self.NEWSKG.hasRole,
                     Literal(entity.extra["role"], datatype=XSD.string)
@@ -150,32 +230,19 @@ class RDFGenerator:
         Returns:
             StatementのURIRef
         """
-        stmt_uri = URIRef(statement.to_uri(str(self.NEWSKG)))
+        stmt_uri = URIRef(statement.to_uri(self._ns_str))
 
         # Statementタイプに応じたクラスを設定
-        type_class_map = {
-            "DissolutionAnnouncement": self.NEWSKG.DissolutionAnnouncement,
-            "ElectionResult": self.NEWSKG.ElectionResult,
-            "CandidateAnnouncement": self.NEWSKG.CandidateAnnouncement,
-            "ElectionSchedule": self.NEWSKG.ElectionStatement,
-            "EarthquakeEvent": self.NEWSKG.EarthquakeEvent,
-            "WeatherDisaster": self.NEWSKG.WeatherDisaster,
-            "EvacuationOrder": self.NEWSKG.EvacuationOrder,
-            "DamageReport": self.NEWSKG.DisasterStatement,
-            "PolicyAnnouncement": self.NEWSKG.PolicyAnnouncement,
-            "BudgetDecision": self.NEWSKG.BudgetDecision,
-            "LegislationEvent": self.NEWSKG.LegislationEvent,
-        }
-        stmt_class = type_class_map.get(
+        stmt_class = self.STATEMENT_CLASS_MAP.get(
             statement.statement_type, self.NEWSKG.Statement
         )
-        self.graph.add((stmt_uri, RDF.type, stmt_class))
+        self._add((stmt_uri, RDF.type, stmt_class))
 
         # 抽出元記事への参照
-        self.graph.add((stmt_uri, self.NEWSKG.extractedFrom, article_uri))
+        self._add((stmt_uri, self.NEWSKG.extractedFrom, article_uri))
 
         # 信頼度
-        self.graph.add((
+        self._add((
             stmt_uri,
             self.NEWSKG.hasConfidence,
             Literal(statement.confidence, datatype=XSD.decimal)
@@ -186,13 +253,13 @@ class RDFGenerator:
 
         # 関連エンティティを関連付け（追加は事前に済ませる）
         for entity in statement.entities:
-            entity_uri = URIRef(entity.to_uri(str(self.NEWSKG)))
+            entity_uri = self._entity_uri(entity)
             if entity.entity_type == "person":
-                self.graph.add((stmt_uri, self.NEWSKG.hasActor, entity_uri))
+                self._add((stmt_uri, self.NEWSKG.hasActor, entity_uri))
             elif entity.entity_type == "place":
-                self.graph.add((stmt_uri, self.NEWSKG.hasLocation, entity_uri))
+                self._add((stmt_uri, self.NEWSKG.hasLocation, entity_uri))
             elif entity.entity_type == "organization":
-                self.graph.add((stmt_uri, self.NEWSKG.hasActor, entity_uri))
+                self._add((stmt_uri, self.NEWSKG.hasActor, entity_uri))
 
         return stmt_uri
 
@@ -202,7 +269,7 @@ class RDFGenerator:
 
         # 予算額
         if "budget_amount_yen" in data:
-            self.graph.add((
+            self._add((
                 stmt_uri,
                 self.NEWSKG.hasBudgetAmount,
                 Literal(data["budget_amount_yen"], datatype=XSD.decimal)
@@ -210,7 +277,7 @@ class RDFGenerator:
 
         # 政策分野
         if "policy_area" in data:
-            self.graph.add((
+            self._add((
                 stmt_uri,
                 self.NEWSKG.hasPolicyArea,
                 Literal(data["policy_area"], datatype=XSD.string)
@@ -218,7 +285,7 @@ class RDFGenerator:
 
         # 災害種別
         if "disaster_type" in data:
-            self.graph.add((
+            self._add((
                 stmt_uri,
                 self.NEWSKG.hasDisasterType,
                 Literal(data["disaster_type"], datatype=XSD.string)
@@ -226,7 +293,7 @@ class RDFGenerator:
 
         # 震度
         if "seismic_intensity" in data:
-            self.graph.add((
+            self._add((
                 stmt_uri,
                 self.NEWSKG.hasSeismicIntensity,
                 Literal(data["seismic_intensity"], datatype=XSD.string)
@@ -234,7 +301,7 @@ class RDFGenerator:
 
         # マグニチュード
         if "magnitude" in data:
-            self.graph.add((
+            self._add((
                 stmt_uri,
                 self.NEWSKG.hasMagnitude,
                 Literal(data["magnitude"], datatype=XSD.decimal)
@@ -242,7 +309,7 @@ class RDFGenerator:
 
         # 選挙種別
         if "election_type" in data:
-            self.graph.add((
+            self._add((
                 stmt_uri,
                 self.NEWSKG.hasElectionType,
                 Literal(data["election_type"], datatype=XSD.string)
@@ -298,17 +365,57 @@ class RDFGenerator:
 
         Args:
             output_path: 出力ファイルパス
-            format: 出力フォーマット
+            format: 出力フォーマット（nt の場合はストリーム書き出し）
         """
+        if format in ("nt", "ntriples"):
+            self.save_nt_streaming(output_path)
+            return
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
         self.graph.serialize(destination=str(output_path), format=format)
 
+    def save_nt_streaming(self, output_path: str):
+        """
+        RDFグラフをN-Triples形式でストリーム書き出し
+
+        rdflibのシリアライザを通さず、トリプルバッファから1行ずつ直接書き出す。
+
+        Args:
+            output_path: 出力ファイルパス
+        """
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # URIRef・データ型ごとのバイト表現キャッシュ
+        node_cache: Dict = {}
+
+        def encode(node) -> bytes:
+            if isinstance(node, Literal):
+                value = '"' + str(node).translate(_NT_ESCAPE) + '"'
+                if node.language:
+                    return (value + "@" + node.language).encode("utf-8")
+                if node.datatype:
+                    return value.encode("utf-8") + b"^^" + encode(node.datatype)
+                return value.encode("utf-8")
+            term = node_cache.get(node)
+            if term is None:
+                if isinstance(node, BNode):
+                    term = f"_:{node}".encode("utf-8")
+                else:
+                    term = f"<{node}>".encode("utf-8")
+                node_cache[node] = term
+            return term
+
+        # バッファを反映してからグラフ（重複なしの集合）を走査して書き出す
+        with open(output_path, "wb", buffering=1 << 20) as f:
+            for s, p, o in self.graph:
+                f.write(b" ".join((encode(s), encode(p), encode(o))) + b" .\n")
+
     def get_statistics(self) -> dict:
-        """グラフの統計情報を取得"""
+        """グラフの統計情報を取得（flush時に更新した集合から返す）"""
         return {
             "total_triples": len(self.graph),
-            "subjects": len(set(self.graph.subjects())),
-            "predicates": len(set(self.graph.predicates())),
-            "objects": len(set(self.graph.objects())),
+            "subjects": len(self._subject_set),
+            "predicates": len(self._predicate_set),
+            "objects": len(self._object_set),
         }
@@ -5,9 +5,13 @@ LLMが抽出したトリプルをRDF（Turtle形式）に変換します。
 Statementを廃止し、エンティティ間の直接関係を表現します。
 """
 
+import os
 import re
 import hashlib
-from typing import List, Dict, Any, Set
+import functools
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, List, Dict, Any, Iterable, Optional, Set, Tuple
 from pathlib import Path
 from datetime import datetime
 from rdflib import Graph, Namespace, Literal, URIRef
@@ -15,9 +19,158 @@ from rdflib.namespace import RDF, RDFS, XSD
 
 from extractors.llm_extractor import Triple, ExtractionResult as TripleExtractionResult
 from extractors.entity_resolver import EntityResolver, ResolvedEntity, get_resolver
+from dictionaries import DictionaryLoader
 from extractors.predicate_normalizer import PredicateNormalizer, get_normalizer
 
 
+# URIにそのまま使える述語ID
+_SAFE_RE = re.compile(r'[a-zA-Z0-9_]+').fullmatch
+
+
+@functools.lru_cache(maxsize=4096)
+def _safe_uri_part(text: str) -> str:
+    """URI安全な文字列に変換（同じ述語は繰り返し現れるため結果をキャッシュ）"""
+    # 英数字とアンダースコアのみ残す
+    if text.isascii() and _SAFE_RE(text):
+        return text.lower()
+
+    # 日本語などはハッシュに変換
+    # （マスター辞書の pred_ 別名と対応させるため MD5 先頭8桁を維持する）
+    hash_val = hashlib.md5(text.encode()).hexdigest()[:8]
+    return f"pred_{hash_val}"
+
+
+# エンティティ解決をプロセス並列化する最小の (テキスト, タイプ) 組数
+PARALLEL_RESOLVE_MIN_PAIRS = 2000
+
+
+# ワーカープロセスのエンティティ解決器（_init_resolve_worker で構築）
+_worker_resolver: Optional[EntityResolver] = None
+
+
+def _init_resolve_worker(dictionaries_dir: Path):
+    """ワーカープロセスで親プロセスと同じ辞書ディレクトリから解決器を構築"""
+    global _worker_resolver
+    _worker_resolver = EntityResolver(DictionaryLoader(dictionaries_dir))
+
+
+def _resolve_chunk(pairs: List[Tuple[str, str]]) -> List[ResolvedEntity]:
+    """ワーカープロセスでエンティティを解決"""
+    return _worker_resolver.resolve_batch(pairs)
+
+
+# N-Triples リテラルのエスケープ表
+_NT_ESCAPE = str.maketrans({
+    "\\": "\\\\",
+    '"': '\\"',
+    "\n": "\\n",
+    "\r": "\\r",
+})
+
+
+# よく使うリテラルの言語タグ・データ型のN-Triples表記
+_JA_SUFFIX = "@ja"
+_STRING_SUFFIX = f"^^<{XSD.string}>"
+_ANYURI_SUFFIX = f"^^<{XSD.anyURI}>"
+_DATETIME_SUFFIX = f"^^<{XSD.dateTime}>"
+_DECIMAL_SUFFIX = f"^^<{XSD.decimal}>"
+
+
+class FastNTWriter:
+    """
+    N-Triples行を直接組み立てて蓄積するライター
+
+    rdflibのストア（インデックス付きの3重辞書）を経由せず、
+    トリプルを1行の文字列として挿入順に保持する（同一行は1回だけ保持）。
+
+    stream を渡した場合は新しい行だけを UTF-8 で逐次書き出す
+    （重複判定のため、出力済みの行は集合に保持する）。
+    """
+
+    def __init__(self, stream: Optional[BinaryIO] = None):
+        self._lines: Dict[str, None] = {}
+        self._term_cache: Dict[URIRef, str] = {}
+        self._stream = stream
+        self._seen: Set[str] = set()
+
+    def __len__(self) -> int:
+        if self._stream is not None:
+            return len(self._seen)
+        return len(self._lines)
+
+    def _term(self, node) -> str:
+        """ノードをN-Triples表記に変換（URIは変換結果をキャッシュ）"""
+        if isinstance(node, Literal):
+            value = '"' + str(node).translate(_NT_ESCAPE) + '"'
+            if node.language:
+                return f"{value}@{node.language}"
+            if node.datatype:
+                return f"{value}^^{self._term(node.datatype)}"
+            return value
+        term = self._term_cache.get(node)
+        if term is None:
+            term = self._term_cache[node] = f"<{node}>"
+        return term
+
+    def _add(self, line: str):
+        """行を追加（ストリーム指定時は未出力の行だけを書き出す）"""
+        if self._stream is None:
+            self._lines[line] = None
+            return
+        if line not in self._seen:
+            self._seen.add(line)
+            self._stream.write(line.encode("utf-8"))
+
+    def emit(self, s, p, o):
+        """トリプルを1行追加"""
+        self._add(f"{self._term(s)} {self._term(p)} {self._term(o)} .\n")
+
+    def emit_literal(self, s, p, value, suffix: str = ""):
+        """
+        目的語がリテラルのトリプルを1行追加（rdflibのLiteralを生成しない）
+
+        Args:
+            s: 主語
+            p: 述語
+            value: リテラルの値（字句形式は str(value)）
+            suffix: 言語タグまたはデータ型の表記（例: "@ja", _STRING_SUFFIX）
+        """
+        literal = '"' + str(value).translate(_NT_ESCAPE) + '"' + suffix
+        self._add(f"{self._term(s)} {self._term(p)} {literal} .\n")
+
+    def flush(self):
+        """ストリームに書き出した内容をフラッシュ"""
+        if self._stream is not None:
+            self._stream.flush()
+
+    def getvalue(self) -> str:
+        """
+        蓄積したN-Triples文字列を返す
+
+        ストリーム指定時は書き出した内容を読み戻す
+        （読み書き可能かつシーク可能なストリームのみ）。
+        """
+        if self._stream is None:
+            return "".join(self._lines)
+        stream = self._stream
+        if not (stream.readable() and stream.seekable()):
+            raise ValueError("出力ストリームから内容を読み戻せません（w+b などで開いてください）")
+        stream.flush()
+        position = stream.tell()
+        stream.seek(0)
+        data = stream.read()
+        stream.seek(position)
+        return data.decode("utf-8")
+
+    def clear(self):
+        """蓄積したトリプルを破棄（シーク可能なストリームは先頭まで切り詰める）"""
+        self._lines.clear()
+        self._seen.clear()
+        if self._stream is not None and self._stream.seekable():
+            self._stream.seek(0)
+            self._stream.truncate()
+
+
 class TripleBasedRDFGenerator:
     """トリプルベースのRDFグラフを生成するクラス"""
 
@@ -26,39 +179,88 @@ class TripleBasedRDFGenerator:
     DCT = Namespace("http://purl.org/dc/terms/")
     SCHEMA = Namespace("http://schema.org/")
 
+    # エンティティタイプ → クラス
+    ENTITY_CLASS_MAP = {
+        "organization": NEWSKG.Organization,
+        "person": NEWSKG.Person,
+        "place": NEWSKG.Place,
+        "event": NEWSKG.Event,
+        "other": NEWSKG.Entity,
+    }
+
     def __init__(
         self,
         entity_resolver: EntityResolver = None,
-        predicate_normalizer: PredicateNormalizer = None
+        predicate_normalizer: PredicateNormalizer = None,
+        output_stream: Optional[BinaryIO] = None
     ):
         """
         Args:
             entity_resolver: エンティティ解決器
             predicate_normalizer: 述語正規化器
+            output_stream: N-Triplesを逐次書き出すバイナリストリーム
+                （指定時はトリプルをメモリに蓄積しない）
         """
-        self.graph = Graph()
+        self.writer = FastNTWriter(output_stream)
+        self._graph: Optional[Graph] = None
         self.entity_resolver = entity_resolver or get_resolver()
         self.predicate_normalizer = predicate_normalizer or get_normalizer()
         
         # キャッシュ
         self.entity_cache: Set[str] = set()
-        self.triple_cache: Set[str] = set()
+        # (主語, 述語, 目的語) → reification URI
+        self.triple_cache: Dict[Tuple[str, str, str], URIRef] = {}
         self.predicate_uris: Dict[str, URIRef] = {}
-        
-        self._bind_namespaces()
+        self._ns_str = str(self.NEWSKG)
+        self._triple_uri_prefix = f"{self._ns_str}triple_"
+        self._entity_uris: Dict[Tuple[str, str], URIRef] = {}
+        self._normalized_predicates: Dict[str, Tuple[str, str]] = {}
+
+        # 統計用カウンタ（グラフを走査せずに get_statistics を返す）
+        self._entity_type_counts: Counter = Counter()
+        self._article_uris: Set[URIRef] = set()
 
-    def _bind_namespaces(self):
+    @property
+    def graph(self) -> Graph:
+        """
+        RDFグラフ（N-Triplesから組み立て、追加があるまで再利用する）
+
+        Turtle出力や検証など、rdflibのGraphが必要な場合にのみ構築される。
+        """
+        if self._graph is None:
+            graph = Graph()
+            self._bind_namespaces(graph)
+            graph.parse(data=self.writer.getvalue(), format="nt")
+            self._graph = graph
+        return self._graph
+
+    def _bind_namespaces(self, graph: Graph):
         """名前空間をバインド"""
-        self.graph.bind("newskg", self.NEWSKG)
-        self.graph.bind("dct", self.DCT)
-        self.graph.bind("schema", self.SCHEMA)
+        graph.bind("newskg", self.NEWSKG)
+        graph.bind("dct", self.DCT)
+        graph.bind("schema", self.SCHEMA)
+
+    def _emit(self, triple):
+        """トリプルをN-Triplesライターに追加"""
+        self._graph = None
+        self.writer.emit(*triple)
+
+    def _emit_literal(self, s, p, value, suffix: str = ""):
+        """リテラルを目的語とするトリプルをN-Triplesライターに追加"""
+        self._graph = None
+        self.writer.emit_literal(s, p, value, suffix)
 
     def reset(self):
         """グラフをリセット"""
-        self.graph = Graph()
+        self.writer.clear()
+        self._graph = None
         self.entity_cache.clear()
         self.triple_cache.clear()
-        self._bind_namespaces()
+        self.predicate_uris.clear()
+        self._entity_uris.clear()
+        self._normalized_predicates.clear()
+        self._entity_type_counts.clear()
+        self._article_uris.clear()
 
     def add_article(self, article: Dict[str, Any]) -> URIRef:
         """
@@ -71,32 +273,21 @@ class TripleBasedRDFGenerator:
             記事のURIRef
         """
         article_id = article.get("id", "unknown")
-        article_uri = URIRef(f"{self.NEWSKG}article_{article_id}")
+        article_uri = URIRef(f"{self._ns_str}article_{article_id}")
+        self._article_uris.add(article_uri)
 
         # 型を追加
-        self.graph.add((article_uri, RDF.type, self.NEWSKG.NewsArticle))
+        self._emit((article_uri, RDF.type, self.NEWSKG.NewsArticle))
 
         # プロパティを追加
         if "title" in article:
-            self.graph.add((
-                article_uri,
-                self.NEWSKG.hasTitle,
-                Literal(article["title"], datatype=XSD.string)
-            ))
+            self._emit_literal(article_uri, self.NEWSKG.hasTitle, article["title"], _STRING_SUFFIX)
 
         if "url" in article:
-            self.graph.add((
-                article_uri,
-                self.NEWSKG.hasUrl,
-                Literal(article["url"], datatype=XSD.anyURI)
-            ))
+            self._emit_literal(article_uri, self.NEWSKG.hasUrl, article["url"], _ANYURI_SUFFIX)
 
         if "pubDate" in article:
-            self.graph.add((
-                article_uri,
-                self.NEWSKG.hasPubDate,
-                Literal(article["pubDate"], datatype=XSD.dateTime)
-            ))
+            self._emit_literal(article_uri, self.NEWSKG.hasPubDate, article["pubDate"], _DATETIME_SUFFIX)
 
         return article_uri
 
@@ -110,46 +301,44 @@ class TripleBasedRDFGenerator:
         Returns:
             エンティティのURIRef
         """
-        entity_uri = URIRef(entity.to_uri(str(self.NEWSKG)))
+        entity_uri = self._entity_uri(entity)
 
         # 既に追加済みなら再利用
         if str(entity_uri) in self.entity_cache:
             return entity_uri
 
         self.entity_cache.add(str(entity_uri))
+        self._entity_type_counts[entity.entity_type] += 1
 
         # エンティティタイプに応じたクラスを設定
-        type_class_map = {
-            "organization": self.NEWSKG.Organization,
-            "person": self.NEWSKG.Person,
-            "place": self.NEWSKG.Place,
-            "event": self.NEWSKG.Event,
-            "other": self.NEWSKG.Entity,
-        }
-        entity_class = type_class_map.get(entity.entity_type, self.NEWSKG.Entity)
-        self.graph.add((entity_uri, RDF.type, entity_class))
+        entity_class = self.ENTITY_CLASS_MAP.get(entity.entity_type, self.NEWSKG.Entity)
+        self._emit((entity_uri, RDF.type, entity_class))
 
         # ラベルを追加
-        self.graph.add((
-            entity_uri,
-            self.NEWSKG.hasLabel,
-            Literal(entity.label, lang="ja")
-        ))
+        self._emit_literal(entity_uri, self.NEWSKG.hasLabel, entity.label, _JA_SUFFIX)
 
         # 元のテキストが異なる場合は別名として追加
         if entity.original_text != entity.label:
-            self.graph.add((
-                entity_uri,
-                self.NEWSKG.hasAlias,
-                Literal(entity.original_text, lang="ja")
-            ))
+            self._emit_literal(entity_uri, self.NEWSKG.hasAlias, entity.original_text, _JA_SUFFIX)
 
         return entity_uri
 
+    def _entity_uri(self, entity: ResolvedEntity) -> URIRef:
+        """エンティティのURIRefを取得（タイプとIDが同じなら同じオブジェクトを再利用）"""
+        key = (entity.entity_type, entity.id)
+        uri = self._entity_uris.get(key)
+        if uri is None:
+            uri = self._entity_uris[key] = URIRef(entity.to_uri(self._ns_str))
+        return uri
+
     def _get_predicate_uri(self, predicate: str) -> URIRef:
         """述語のURIを取得（正規化を適用）"""
-        # 正規化
-        pred_id, pred_label = self.predicate_normalizer.normalize(predicate)
+        # 正規化（同じ述語の正規化結果は再利用）
+        normalized = self._normalized_predicates.get(predicate)
+        if normalized is None:
+            normalized = self._normalized_predicates[predicate] = \
+                self.predicate_normalizer.normalize(predicate)
+        pred_id, pred_label = normalized
         
         # キャッシュ確認
         if pred_id in self.predicate_uris:
@@ -157,24 +346,18 @@ class TripleBasedRDFGenerator:
         
         # 安全なURI用IDを生成
         safe_id = self._make_safe_uri_part(pred_id)
-        pred_uri = URIRef(f"{self.NEWSKG}rel_{safe_id}")
+        pred_uri = URIRef(f"{self._ns_str}rel_{safe_id}")
         
         # 述語自体の定義を追加
-        self.graph.add((pred_uri, RDF.type, RDF.Property))
-        self.graph.add((pred_uri, RDFS.label, Literal(pred_label, lang="ja")))
+        self._emit((pred_uri, RDF.type, RDF.Property))
+        self._emit_literal(pred_uri, RDFS.label, pred_label, _JA_SUFFIX)
         
         self.predicate_uris[pred_id] = pred_uri
         return pred_uri
 
     def _make_safe_uri_part(self, text: str) -> str:
         """URI安全な文字列に変換"""
-        # 英数字とアンダースコアのみ残す
-        if re.match(r'^[a-zA-Z0-9_]+$', text):
-            return text.lower()
-        
-        # 日本語などはハッシュに変換
-        hash_val = hashlib.md5(text.encode()).hexdigest()[:8]
-        return f"pred_{hash_val}"
+        return _safe_uri_part(text)
 
     def add_triple(
         self,
@@ -195,6 +378,31 @@ class TripleBasedRDFGenerator:
         subject_entity = self.entity_resolver.resolve(triple.subject, triple.subject_type)
         object_entity = self.entity_resolver.resolve(triple.object, triple.object_type)
 
+        return self.add_triple_with_resolved(
+            triple, subject_entity, object_entity, article_uri
+        )
+
+    def add_triple_with_resolved(
+        self,
+        triple: Triple,
+        subject_entity: ResolvedEntity,
+        object_entity: ResolvedEntity,
+        article_uri: URIRef = None,
+        extracted_at: Optional[str] = None
+    ) -> URIRef:
+        """
+        解決済みのエンティティを使ってトリプルをRDFグラフに追加
+
+        Args:
+            triple: Tripleオブジェクト
+            subject_entity: 解決済みの主語エンティティ
+            object_entity: 解決済みの目的語エンティティ
+            article_uri: 抽出元記事のURI（オプション）
+            extracted_at: 抽出時刻のISO形式文字列（省略時はトリプルから生成）
+
+        Returns:
+            トリプルのreification URIRef
+        """
         # エンティティをグラフに追加
         subject_uri = self.add_entity(subject_entity)
         object_uri = self.add_entity(object_entity)
@@ -203,40 +411,36 @@ class TripleBasedRDFGenerator:
         predicate_uri = self._get_predicate_uri(triple.predicate)
 
         # 直接関係を追加
-        self.graph.add((subject_uri, predicate_uri, object_uri))
+        self._emit((subject_uri, predicate_uri, object_uri))
 
         # Reification（メタ情報の付与）
-        triple_id = triple.get_id()
+        # 同じトリプルの重複を避ける（既出ならID生成も省く）
+        cache_key = (triple.subject, triple.predicate, triple.object)
+        triple_uri = self.triple_cache.get(cache_key)
+        if triple_uri is not None:
+            return triple_uri
         
-        # 同じトリプルの重複を避ける
-        if triple_id in self.triple_cache:
-            return URIRef(f"{self.NEWSKG}triple_{triple_id}")
+        triple_uri = URIRef(self._triple_uri_prefix + triple.get_id())
+        self.triple_cache[cache_key] = triple_uri
         
-        self.triple_cache.add(triple_id)
-        
-        triple_uri = URIRef(f"{self.NEWSKG}triple_{triple_id}")
-        self.graph.add((triple_uri, RDF.type, self.NEWSKG.NewsTriple))
-        self.graph.add((triple_uri, RDF.subject, subject_uri))
-        self.graph.add((triple_uri, RDF.predicate, predicate_uri))
-        self.graph.add((triple_uri, RDF.object, object_uri))
+        self._emit((triple_uri, RDF.type, self.NEWSKG.NewsTriple))
+        self._emit((triple_uri, RDF.subject, subject_uri))
+        self._emit((triple_uri, RDF.predicate, predicate_uri))
+        self._emit((triple_uri, RDF.object, object_uri))
 
         # 信頼度
-        self.graph.add((
-            triple_uri,
-            self.NEWSKG.hasConfidence,
-            Literal(triple.confidence, datatype=XSD.decimal)
-        ))
+        self._emit_literal(triple_uri, self.NEWSKG.hasConfidence, triple.confidence, _DECIMAL_SUFFIX)
 
         # 抽出元記事
         if article_uri:
-            self.graph.add((triple_uri, self.NEWSKG.extractedFrom, article_uri))
+            self._emit((triple_uri, self.NEWSKG.extractedFrom, article_uri))
 
         # 抽出時刻
-        self.graph.add((
-            triple_uri,
-            self.NEWSKG.extractedAt,
-            Literal(triple.extraction_timestamp.isoformat(), datatype=XSD.dateTime)
-        ))
+        if extracted_at is None:
+            extracted_at = triple.extraction_timestamp.isoformat()
+        self._emit_literal(
+            triple_uri, self.NEWSKG.extractedAt, extracted_at, _DATETIME_SUFFIX
+        )
 
         return triple_uri
 
@@ -249,19 +453,116 @@ class TripleBasedRDFGenerator:
             article: 記事辞書（オプション）
         """
         # 記事を追加
-        article_uri = None
+        article_uri = self._add_result_article(result, article)
+
+        # 記事内のエンティティをまとめて解決してからトリプルを追加
+        pairs = []
+        for triple in result.triples:
+            pairs.append((triple.subject, triple.subject_type))
+            pairs.append((triple.object, triple.object_type))
+        resolved = self.entity_resolver.resolve_batch(pairs)
+
+        for i, (triple, extracted_at) in enumerate(self._with_timestamps(result.triples)):
+            self.add_triple_with_resolved(
+                triple, resolved[2 * i], resolved[2 * i + 1], article_uri, extracted_at
+            )
+
+    def add_extraction_results(
+        self,
+        items: Iterable[Tuple[TripleExtractionResult, Optional[Dict[str, Any]]]],
+        max_workers: Optional[int] = None
+    ):
+        """
+        複数の抽出結果をまとめてRDFグラフに追加
+
+        全記事のエンティティを重複なく集めてプロセスプールで並列に解決し、
+        グラフへの書き込みは記事順に逐次行う。
+
+        Args:
+            items: (TripleExtractionResult, 記事辞書またはNone) のイテラブル
+            max_workers: 解決に使うワーカープロセス数（1の場合は逐次処理）
+        """
+        items = list(items)
+        pairs = list(dict.fromkeys(
+            pair
+            for result, _ in items
+            for triple in result.triples
+            for pair in (
+                (triple.subject, triple.subject_type),
+                (triple.object, triple.object_type),
+            )
+        ))
+        resolved = self._resolve_pairs(pairs, max_workers)
+
+        for result, article in items:
+            article_uri = self._add_result_article(result, article)
+            for triple, extracted_at in self._with_timestamps(result.triples):
+                self.add_triple_with_resolved(
+                    triple,
+                    resolved[(triple.subject, triple.subject_type)],
+                    resolved[(triple.object, triple.object_type)],
+                    article_uri,
+                    extracted_at
+                )
+
+    @staticmethod
+    def _with_timestamps(triples: List[Triple]) -> Iterable[Tuple[Triple, str]]:
+        """トリプルと抽出時刻のISO形式文字列の組を返す（同じ時刻の変換は1回だけ）"""
+        last_timestamp = None
+        extracted_at = None
+        for triple in triples:
+            timestamp = triple.extraction_timestamp
+            if timestamp != last_timestamp:
+                last_timestamp = timestamp
+                extracted_at = timestamp.isoformat()
+            yield triple, extracted_at
+
+    def _resolve_pairs(
+        self, pairs: List[Tuple[str, str]], max_workers: Optional[int] = None
+    ) -> Dict[Tuple[str, str], ResolvedEntity]:
+        """
+        (テキスト, タイプ) の組を解決（組数が多い場合はプロセス並列）
+
+        ワーカーは親の解決器と同じ辞書ディレクトリから解決器を構築する。
+        サブクラスなど辞書ディレクトリから再現できない解決器が渡された場合は逐次処理する。
+        """
+        resolver = self.entity_resolver
+        reproducible = (
+            type(resolver) is EntityResolver and type(resolver.loader) is DictionaryLoader
+        )
+        if max_workers == 1 or len(pairs) < PARALLEL_RESOLVE_MIN_PAIRS or not reproducible:
+            return dict(zip(pairs, resolver.resolve_batch(pairs)))
+
+        workers = max_workers or os.cpu_count() or 1
+        chunk_size = -(-len(pairs) // (workers * 4))
+        chunks = [pairs[i:i + chunk_size] for i in range(0, len(pairs), chunk_size)]
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_resolve_worker,
+            initargs=(resolver.loader.dictionaries_dir,)
+        ) as executor:
+            entities = [e for chunk in executor.map(_resolve_chunk, chunks) for e in chunk]
+
+        # ワーカーで生成された新規エンティティを親プロセスの解決器にも登録
+        for entity in entities:
+            if not entity.is_known and entity.id != "unknown":
+                resolver.new_entities.setdefault(entity.id, entity)
+
+        return dict(zip(pairs, entities))
+
+    def _add_result_article(
+        self, result: TripleExtractionResult, article: Optional[Dict[str, Any]]
+    ) -> Optional[URIRef]:
+        """抽出結果の記事をグラフに追加"""
         if article:
-            article_uri = self.add_article(article)
-        elif result.article_id:
+            return self.add_article(article)
+        if result.article_id:
             # 記事情報がない場合は最小限の情報で追加
-            article_uri = self.add_article({
+            return self.add_article({
                 "id": result.article_id,
                 "title": result.article_title
             })
-
-        # トリプルを追加
-        for triple in result.triples:
-            self.add_triple(triple, article_uri)
+        return None
 
     def serialize(self, format: str = "turtle") -> str:
         """
@@ -273,6 +574,8 @@ class TripleBasedRDFGenerator:
         Returns:
             シリアライズされた文字列
         """
+        if format in ("nt", "ntriples"):
+            return self.writer.getvalue()
         return self.graph.serialize(format=format)
 
     def save(self, output_path: str, format: str = "turtle"):
@@ -281,46 +584,38 @@ class TripleBasedRDFGenerator:
 
         Args:
             output_path: 出力ファイルパス
-            format: 出力フォーマット
+            format: 出力フォーマット（nt の場合はN-Triplesをそのまま書き出す）
         """
+        self.writer.flush()
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
+        if format in ("nt", "ntriples"):
+            with open(output_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+                f.write(self.writer.getvalue())
+            return
         self.graph.serialize(destination=str(output_path), format=format)
 
     def get_statistics(self) -> Dict[str, Any]:
-        """グラフの統計情報を取得"""
+        """グラフの統計情報を取得（追加時に更新したカウンタから返す）"""
         # エンティティタイプ別カウント
         entity_counts = {
-            "person": 0,
-            "organization": 0,
-            "place": 0,
+            "person": self._entity_type_counts["person"],
+            "organization": self._entity_type_counts["organization"],
+            "place": self._entity_type_counts["place"],
             "other": 0
         }
         
-        for entity_type, newskg_class in [
-            ("person", self.NEWSKG.Person),
-            ("organization", self.NEWSKG.Organization),
-            ("place", self.NEWSKG.Place),
-        ]:
-            entity_counts[entity_type] = len(list(
-                self.graph.subjects(RDF.type, newskg_class)
-            ))
-        
         # 記事数
-        article_count = len(list(
-            self.graph.subjects(RDF.type, self.NEWSKG.NewsArticle)
-        ))
+        article_count = len(self._article_uris)
         
         # トリプル数
-        triple_count = len(list(
-            self.graph.subjects(RDF.type, self.NEWSKG.NewsTriple)
-        ))
+        triple_count = len(self.triple_cache)
         
         # 述語数
         predicate_count = len(self.predicate_uris)
         
         return {
-            "total_rdf_triples": len(self.graph),
+            "total_rdf_triples": len(self.writer),
             "articles": article_count,
             "news_triples": triple_count,
             "unique_predicates": predicate_count,
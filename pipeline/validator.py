@@ -4,32 +4,274 @@ SHACL検証モジュール
 生成されたRDFデータをSHACL制約で検証します。
 """
 
-from typing import Tuple, Optional
+import os
+import json
+import pickle
+import hashlib
+import functools
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple, Optional
 from pathlib import Path
-from rdflib import Graph
+from rdflib import Graph, BNode, plugin
+from rdflib.parser import Parser
+from rdflib.serializer import Serializer
 from rdflib.namespace import RDF, SH
+import rdflib
+import pyshacl
 from pyshacl import validate
 
 from ontology import SHAPES_TTL
 
+try:
+    import oxrdflib
+except ImportError:  # oxrdflib未導入時はrdflib標準のTurtleパーサーを使用
+    oxrdflib = None
+
+# Turtleのパースに使うrdflibパーサー（oxrdflibがあればRust実装のパーサー）
+TURTLE_FORMAT = "ox-turtle" if oxrdflib is not None else "turtle"
+
+# 検証で使うパーサー・シリアライザーのプラグインをインポート時に読み込んでおく
+# （最初の parse / serialize でプラグインモジュールを読み込む遅延をなくす）
+for _format in (TURTLE_FORMAT, "nt"):
+    plugin.get(_format, Parser)
+plugin.get("nt", Serializer)
+
+
+# キャッシュの互換性を判定するライブラリのバージョン
+# （更新後に旧版のピクルや検証結果を使わないようキーに含める）
+_LIBRARY_VERSIONS = (rdflib.__version__, getattr(pyshacl, "__version__", ""))
+
+
+# パース済みグラフのピクルキャッシュ（ソースのTTLと同じディレクトリには書き出さない）
+GRAPH_CACHE_DIR = Path("cache/graphs")
+# 保持するピクルの数の上限（更新前の版は最終参照が古いものから削除）
+GRAPH_CACHE_MAX_FILES = 8
+
+
+def _pickle_path(path: Path, mtime_ns: int) -> Path:
+    """パース済みグラフのピクルキャッシュのパス（パス・更新時刻・ライブラリ版をキーにする）"""
+    key_source = json.dumps([str(path.resolve()), mtime_ns, _LIBRARY_VERSIONS])
+    key = hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+    return GRAPH_CACHE_DIR / f"{key}.pkl"
+
+
+@functools.lru_cache(maxsize=4)
+def _load_graph_cached(path_str: str, mtime_ns: int) -> Graph:
+    """
+    Turtleファイルを一度だけパース（パスと更新時刻をキーにプロセス内でキャッシュ）
+
+    プロセス起動時は cache/graphs に同じパス・更新時刻・ライブラリバージョンの
+    ピクルキャッシュがあればそれを読み込み、Turtleのパースを省略する。
+    """
+    pickle_path = _pickle_path(Path(path_str), mtime_ns)
+    try:
+        with open(pickle_path, "rb") as f:
+            graph = pickle.load(f)
+        # LRU整理のため参照時刻として mtime を更新
+        os.utime(pickle_path)
+        return graph
+    except Exception:
+        pass  # キャッシュがない・壊れている場合はパースし直す
+
+    graph = Graph()
+    graph.parse(path_str, format=TURTLE_FORMAT)
+
+    try:
+        pickle_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = pickle_path.with_name(pickle_path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump(graph, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, pickle_path)
+        _cleanup_cache(GRAPH_CACHE_DIR, GRAPH_CACHE_MAX_FILES, "*.pkl")
+    except (OSError, pickle.PicklingError):
+        pass  # 書き込めない場合はキャッシュなしで続行
+
+    return graph
+
+
+def _load_graph(path: Path) -> Graph:
+    """Turtleファイルをキャッシュ経由でロード"""
+    return _load_graph_cached(str(path), path.stat().st_mtime_ns)
+
+
+# 検証結果のキャッシュ（データ・シェイプ・推論モードが同じなら再検証しない）
+VALIDATION_CACHE_DIR = Path("cache/shacl")
+# 保持するキャッシュファイル数の上限（超えたら最終参照が古いものから削除）
+VALIDATION_CACHE_MAX_FILES = 32
+
+
+def _file_digest(path: Path) -> str:
+    """ファイル内容のハッシュ（パースせずにバイト列から計算）"""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _load_cached_verdict(cache_path: Path) -> Optional[Tuple[bool, str, Graph]]:
+    """キャッシュ済みの検証結果を読み込み（なければNone）"""
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        # LRU整理のため参照時刻として mtime を更新
+        os.utime(cache_path)
+    except (OSError, ValueError):
+        return None
+    results_graph = Graph()
+    if cached["results"]:
+        results_graph.parse(data=cached["results"], format="nt")
+    return cached["conforms"], cached["report"], results_graph
+
+
+def _save_cached_verdict(
+    cache_path: Path, conforms: bool, results_text: str, results_graph: Graph
+):
+    """検証結果をキャッシュに書き出し（一時ファイル経由で置き換える）"""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "conforms": bool(conforms),
+                "report": results_text,
+                "results": results_graph.serialize(format="nt"),
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+        _cleanup_cache(cache_path.parent, VALIDATION_CACHE_MAX_FILES)
+    except OSError:
+        pass  # 書き込めない場合はキャッシュなしで続行
+
+
+def _cleanup_cache(cache_dir: Path, max_files: int, pattern: str = "*.json"):
+    """キャッシュファイル数が上限を超えたら、最終参照が古いものから削除"""
+    files = sorted(cache_dir.glob(pattern), key=lambda p: p.stat().st_mtime)
+    for path in files[:max(len(files) - max_files, 0)]:
+        path.unlink(missing_ok=True)
+
+
+def _validate_partition(
+    shapes_nt: bytes, data_nt: bytes, ont_nt: Optional[bytes], inference: str
+) -> Tuple[bool, bytes, str]:
+    """ワーカープロセスでシェイプの一部を検証（結果グラフはN-Triplesで返す）"""
+    shapes_graph = Graph().parse(data=shapes_nt, format="nt")
+    data_graph = Graph().parse(data=data_nt, format="nt")
+    ont_graph = Graph().parse(data=ont_nt, format="nt") if ont_nt is not None else None
+    conforms, results_graph, results_text = validate(
+        data_graph,
+        shacl_graph=shapes_graph,
+        ont_graph=ont_graph,
+        inference=inference,
+        abort_on_first=False,
+        meta_shacl=False,
+        advanced=False,
+        js=False,
+        iterate_rules=False,
+        do_owl_imports=False,
+        debug=False,
+    )
+    return conforms, results_graph.serialize(format="nt", encoding="utf-8"), results_text
+
+
+def _partition_shapes(shapes_graph: Graph) -> List[Graph]:
+    """
+    シェイプグラフを互いに参照しないシェイプのまとまりごとに分割
+
+    各ルートシェイプ（NodeShape / PropertyShape）から目的語のブランクノードと
+    参照先のシェイプをたどり、つながったシェイプを同じ部分グラフに入れる。
+    """
+    roots = {
+        s for shape_type in (SH.NodeShape, SH.PropertyShape)
+        for s in shapes_graph.subjects(RDF.type, shape_type)
+        if not isinstance(s, BNode)
+    }
+
+    # Union-Find でシェイプ間の参照をまとめる
+    parent: Dict = {root: root for root in roots}
+
+    def find(node):
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    # ルートごとに到達できるノード（自身・ブランクノード）を集める
+    reachable: Dict = {}
+    for root in roots:
+        nodes = {root}
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            for o in shapes_graph.objects(node, None):
+                if o in roots:
+                    parent[find(o)] = find(root)
+                elif isinstance(o, BNode) and o not in nodes:
+                    nodes.add(o)
+                    stack.append(o)
+        reachable[root] = nodes
+
+    components: Dict = {}
+    for root, nodes in reachable.items():
+        components.setdefault(find(root), set()).update(nodes)
+
+    partitions = []
+    for nodes in components.values():
+        graph = Graph()
+        for node in nodes:
+            for p, o in shapes_graph.predicate_objects(node):
+                graph.add((node, p, o))
+        partitions.append(graph)
+    return partitions
+
 
 class SHACLValidator:
     """SHACL検証を行うクラス"""
 
-    def __init__(self, shapes_path: Optional[str] = None):
+    # shared() で返す既定シェイプのインスタンス（キャッシュ使用の有無ごと）
+    _shared: Dict[bool, "SHACLValidator"] = {}
+
+    def __init__(
+        self,
+        shapes_path: Optional[str] = None,
+        ontology_path: Optional[str] = None,
+        use_cache: bool = False
+    ):
         """
         Args:
             shapes_path: SHACLシェイプファイルのパス
+            ontology_path: 検証時に併用するオントロジーファイルのパス
+                （指定時のみ読み込む。NEWSKG_TTL などを渡す）
+            use_cache: 同じデータファイル・シェイプの検証結果をディスクから再利用する
+                （開発時の繰り返し実行向け。Graphを渡した検証はキャッシュしない）
         """
         self.shapes_path = Path(shapes_path) if shapes_path else SHAPES_TTL
+        self.ontology_path = Path(ontology_path) if ontology_path else None
+        self.use_cache = use_cache
         self.shapes_graph = None
+        self.ont_graph = None
         self._load_shapes()
 
+    @classmethod
+    def shared(cls, use_cache: bool = False) -> "SHACLValidator":
+        """
+        既定のシェイプを使うインスタンスを共有して取得
+
+        Args:
+            use_cache: 検証結果のディスクキャッシュを使うかどうか
+        """
+        validator = cls._shared.get(use_cache)
+        if validator is None:
+            validator = cls._shared[use_cache] = cls(use_cache=use_cache)
+        return validator
+
     def _load_shapes(self):
-        """SHACLシェイプをロード"""
+        """
+        SHACLシェイプとオントロジーを一度だけロード（検証ごとに再パースしない）
+
+        パース結果はインスタンス間で共有されるため、変更しないこと。
+        """
         if self.shapes_path.exists():
-            self.shapes_graph = Graph()
-            self.shapes_graph.parse(str(self.shapes_path), format="turtle")
+            self.shapes_graph = _load_graph(self.shapes_path)
+
+        if self.ontology_path is not None and self.ontology_path.exists():
+            self.ont_graph = _load_graph(self.ontology_path)
 
     def validate(
         self, data_path_or_graph, inference: str = "none"
@@ -40,43 +282,164 @@ class SHACLValidator:
         Args:
             data_path_or_graph: RDFデータのパスまたはGraphオブジェクト
             inference: 推論モード ("none", "rdfs", "owlrl")
+                既定の "none" ではデータグラフを推論で展開しない。
+                RDFS/OWL-RL 推論が必要な場合のみ明示的に指定する。
 
         Returns:
             (適合性, 検証レポートテキスト, 検証結果グラフ)
         """
-        # データグラフをロード
-        if isinstance(data_path_or_graph, Graph):
-            data_graph = data_path_or_graph
-        else:
-            data_graph = Graph()
-            data_graph.parse(str(data_path_or_graph), format="turtle")
-
         if self.shapes_graph is None:
             return True, "シェイプファイルが見つかりません（検証スキップ）", Graph()
 
-        # SHACL検証を実行
+        data_graph = data_path_or_graph if isinstance(data_path_or_graph, Graph) else None
+
+        # 前回と同じデータファイル・シェイプなら検証をスキップ（パース前に判定）
+        cache_path = self._cache_path_for(data_path_or_graph, inference)
+        if cache_path is not None:
+            cached = _load_cached_verdict(cache_path)
+            if cached is not None:
+                return cached
+
+        # データグラフをロード
+        if data_graph is None:
+            data_graph = Graph()
+            data_graph.parse(str(data_path_or_graph), format=TURTLE_FORMAT)
+
+        # SHACL検証を実行（SHACL-AF・JS拡張・owl:imports の解決は使わない）
         conforms, results_graph, results_text = validate(
             data_graph,
             shacl_graph=self.shapes_graph,
+            ont_graph=self.ont_graph,
             inference=inference,
             abort_on_first=False,
             meta_shacl=False,
+            advanced=False,
+            js=False,
+            iterate_rules=False,
+            do_owl_imports=False,
             debug=False,
         )
 
+        if cache_path is not None:
+            _save_cached_verdict(cache_path, conforms, results_text, results_graph)
+
+        return conforms, results_text, results_graph
+
+    def _cache_path_for(self, data_path_or_graph, inference: str) -> Optional[Path]:
+        """キャッシュを使う場合（ファイル入力のみ）の検証結果のキャッシュパス"""
+        if not self.use_cache or isinstance(data_path_or_graph, Graph):
+            return None
+        return self._cache_path(Path(data_path_or_graph), inference)
+
+    def _cache_path(self, data_path: Path, inference: str) -> Path:
+        """データ・シェイプ・オントロジーの版と推論モードから検証結果のキャッシュパスを決める"""
+        # 保存済みファイルのバイト列をそのままハッシュする（再シリアライズしない）
+        data_digest = _file_digest(data_path)
+        ontology_key = (
+            [str(self.ontology_path), self.ontology_path.stat().st_mtime_ns]
+            if self.ont_graph is not None else None
+        )
+        key_source = json.dumps([
+            data_digest,
+            str(self.shapes_path),
+            self.shapes_path.stat().st_mtime_ns,
+            ontology_key,
+            inference,
+            _LIBRARY_VERSIONS,
+        ])
+        key = hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+        return VALIDATION_CACHE_DIR / f"{key}.json"
+
+    def validate_parallel(
+        self,
+        data_path_or_graph,
+        n_workers: Optional[int] = None,
+        inference: str = "none"
+    ) -> Tuple[bool, str, Graph]:
+        """
+        シェイプを独立したまとまりに分割し、プロセス並列でSHACL検証
+
+        データグラフは一度だけN-Triplesにシリアライズして各ワーカーに渡し、
+        各ワーカーの結果グラフを1つにまとめる（適合性は全ワーカーの論理積）。
+
+        Args:
+            data_path_or_graph: RDFデータのパスまたはGraphオブジェクト
+            n_workers: ワーカープロセス数（省略時はCPU数）
+            inference: 推論モード（validate() と同じ）
+
+        Returns:
+            (適合性, 検証レポートテキスト, 検証結果グラフ)
+        """
+        if self.shapes_graph is None:
+            return True, "シェイプファイルが見つかりません（検証スキップ）", Graph()
+
+        workers = n_workers or os.cpu_count() or 1
+        partitions = _partition_shapes(self.shapes_graph)
+        if workers <= 1 or len(partitions) <= 1:
+            return self.validate(data_path_or_graph, inference=inference)
+
+        # 検証結果は分割の有無によらず同じなので validate() と同じキャッシュを使う
+        cache_path = self._cache_path_for(data_path_or_graph, inference)
+        if cache_path is not None:
+            cached = _load_cached_verdict(cache_path)
+            if cached is not None:
+                return cached
+
+        # データグラフをロード
+        if isinstance(data_path_or_graph, Graph):
+            data_graph = data_path_or_graph
+        else:
+            data_graph = Graph()
+            data_graph.parse(str(data_path_or_graph), format=TURTLE_FORMAT)
+
+        # シリアライズは1回だけ行い、全ワーカーで同じバイト列を使う
+        data_nt = data_graph.serialize(format="nt", encoding="utf-8")
+        ont_nt = (
+            self.ont_graph.serialize(format="nt", encoding="utf-8")
+            if self.ont_graph is not None else None
+        )
+
+        # シェイプのまとまりをワーカー数のグループに振り分ける
+        groups = [Graph() for _ in range(min(workers, len(partitions)))]
+        for i, partition in enumerate(partitions):
+            groups[i % len(groups)] += partition
+        shapes_nts = [g.serialize(format="nt", encoding="utf-8") for g in groups]
+
+        with ProcessPoolExecutor(max_workers=len(groups)) as executor:
+            outcomes = list(executor.map(
+                _validate_partition,
+                shapes_nts,
+                [data_nt] * len(groups),
+                [ont_nt] * len(groups),
+                [inference] * len(groups),
+            ))
+
+        conforms = all(c for c, _, _ in outcomes)
+        results_graph = Graph()
+        for _, results_nt, _ in outcomes:
+            # ブランクノードは parse ごとに別ノードになるため結果同士は混ざらない
+            results_graph.parse(data=results_nt, format="nt")
+        results_text = "\n".join(text for c, _, text in outcomes if not c)
+
+        if cache_path is not None:
+            _save_cached_verdict(cache_path, conforms, results_text, results_graph)
+
         return conforms, results_text, results_graph
 
-    def validate_file(self, data_path: str) -> Tuple[bool, str]:
+    def validate_file(
+        self, data_path: str, inference: str = "none"
+    ) -> Tuple[bool, str]:
         """
         ファイルからRDFデータを読み込んで検証
 
         Args:
             data_path: RDFデータファイルのパス
+            inference: 推論モード（既定はOWL-RL展開を行わない "none"）
 
         Returns:
             (適合性, 検証レポートテキスト)
         """
-        conforms, results_text, _ = self.validate(data_path)
+        conforms, results_text, _ = self.validate(data_path, inference=inference)
         return conforms, results_text
 
     def get_validation_summary(
@@ -91,15 +454,17 @@ class SHACLValidator:
         Returns:
             検証結果のサマリー辞書
         """
-        conforms, results_text, results_graph = self.validate(data_path_or_graph)
+        # サマリーは推論なしで検証する
+        conforms, results_text, results_graph = self.validate(
+            data_path_or_graph, inference="none"
+        )
 
         # 違反の数をカウント（SHACL語彙に基づく）
         violation_count = 0
         if not conforms:
-            # sh:ValidationResult を数える
-            violation_count = sum(
-                1
-                for _ in results_graph.triples((None, RDF.type, SH.ValidationResult))
+            # sh:ValidationResult を数える（型のインデックスから主語だけを取得）
+            violation_count = len(
+                set(results_graph.subjects(RDF.type, SH.ValidationResult))
             )
 
         return {
@@ -8,15 +8,25 @@ NewsKG パイプライン実行スクリプト
     uv run python run_pipeline.py --input articles.json --output output/
     uv run python run_pipeline.py  # デフォルト設定で実行
     uv run python run_pipeline.py --upload  # Fusekiにアップロード
+    uv run python run_pipeline.py --upload --delta  # 前回アップロードとの差分のみ反映
 """
 
 import argparse
+import os
+import shutil
 import sys
 import logging
+from operator import itemgetter
 from pathlib import Path
 
 import config
-from pipeline import PipelineProcessor, FusekiUploader
+
+
+def save_uploaded_snapshot(rdf_path: str, uploaded_path: Path):
+    """アップロードしたRDFを次回の差分アップロードの基準として保存"""
+    tmp_path = uploaded_path.with_name(uploaded_path.name + ".tmp")
+    shutil.copyfile(rdf_path, tmp_path)
+    os.replace(tmp_path, uploaded_path)
 
 
 def main():
@@ -37,6 +47,9 @@ def main():
 
     # SHACL検証をスキップ
     uv run run_pipeline.py --no-validate
+
+    # 前回アップロードしたRDFとの差分のみをFusekiに反映
+    uv run run_pipeline.py --upload --delta
         """
     )
 
@@ -60,6 +73,22 @@ def main():
         action="store_true",
         help="SHACL検証をスキップ"
     )
+    parser.add_argument(
+        "--parallel",
+        action="store_true",
+        help="記事の抽出を複数プロセスで並列実行"
+    )
+    parser.add_argument(
+        "--shacl-workers",
+        type=int,
+        default=1,
+        help="SHACL検証をシェイプのまとまりごとに並列実行するプロセス数 (デフォルト: 1 = 逐次)"
+    )
+    parser.add_argument(
+        "--shacl-cache",
+        action="store_true",
+        help="同じ出力・シェイプのSHACL検証結果を cache/shacl から再利用（開発時の繰り返し実行向け）"
+    )
     parser.add_argument(
         "--upload",
         action="store_true",
@@ -80,8 +109,28 @@ def main():
         action="store_true",
         help="Fusekiの既存データを置換（デフォルトは追加）"
     )
+    parser.add_argument(
+        "--delta",
+        action="store_true",
+        help="前回アップロードしたRDFとの差分のみをSPARQL Updateで反映（初回は全体を置換）"
+    )
+    parser.add_argument(
+        "--bulk-load",
+        action="store_true",
+        help="--replace 時に tdb2.tdbloader で直接ロード（Fusekiを停止した同じマシンでのみ有効）"
+    )
+    parser.add_argument(
+        "--tdb-path",
+        default=config.FUSEKI_TDB_PATH,
+        help="--bulk-load で書き込むTDB2データベースディレクトリ"
+    )
 
     args = parser.parse_args()
+    if args.delta and args.replace:
+        parser.error("--delta と --replace は同時に指定できません")
+
+    # rdflib / pyshacl を読み込むため、引数の解析後（--help 以外）にのみインポート
+    from pipeline import PipelineProcessor, FusekiUploader
 
     # 入力ファイルの存在確認
     input_path = Path(args.input)
@@ -108,11 +157,17 @@ def main():
     if args.upload:
         print(f"  エンドポイント: {args.fuseki_endpoint}")
         print(f"  データセット: {args.fuseki_dataset}")
-        print(f"  モード: {'置換' if args.replace else '追加'}")
+        mode = "差分" if args.delta else ("置換" if args.replace else "追加")
+        print(f"  モード: {mode}")
     print("-" * 60)
 
     # パイプライン実行
-    processor = PipelineProcessor(validate=not args.no_validate)
+    processor = PipelineProcessor(
+        validate=not args.no_validate,
+        parallel=args.parallel,
+        validation_workers=args.shacl_workers,
+        validation_cache=args.shacl_cache
+    )
 
     try:
         result = processor.run(
@@ -124,40 +179,44 @@ def main():
         print(f"エラー: パイプライン実行中にエラーが発生しました")
         print(f"  {e}")
         if args.verbose:
-            import traceback
-            traceback.print_exc()
+            logging.exception("パイプライン実行エラー")
         sys.exit(1)
 
-    # 結果表示
-    print("\n" + "=" * 60)
-    print("実行結果")
-    print("=" * 60)
-
+    # 結果表示（まとめて1回で書き出す）
     stats = result["stats"]
-    print(f"処理時間: {result['elapsed_seconds']:.2f}秒")
-    print(f"\n記事統計:")
-    print(f"  総記事数: {stats['total_articles']}")
-    print(f"  Statement抽出記事: {stats['articles_with_statements']}")
-
-    print(f"\nエンティティ統計 (総数: {stats['total_entities']}):")
+    out = [
+        "",
+        "=" * 60,
+        "実行結果",
+        "=" * 60,
+        f"処理時間: {result['elapsed_seconds']:.2f}秒",
+        "",
+        "記事統計:",
+        f"  総記事数: {stats['total_articles']}",
+        f"  Statement抽出記事: {stats['articles_with_statements']}",
+        "",
+        f"エンティティ統計 (総数: {stats['total_entities']}):",
+    ]
     for etype, count in stats["entity_types"].items():
-        print(f"  {etype}: {count}")
+        out.append(f"  {etype}: {count}")
 
-    print(f"\nStatement統計 (総数: {stats['total_statements']}):")
-    for stype, count in sorted(stats["statement_types"].items(), key=lambda x: -x[1]):
-        print(f"  {stype}: {count}")
+    out += ["", f"Statement統計 (総数: {stats['total_statements']}):"]
+    for stype, count in sorted(stats["statement_types"].items(), key=itemgetter(1), reverse=True):
+        out.append(f"  {stype}: {count}")
 
-    print(f"\n出力ファイル:")
+    out += ["", "出力ファイル:"]
     for key, path in result["output_files"].items():
-        print(f"  {key}: {path}")
+        out.append(f"  {key}: {path}")
 
-    print(f"\nSHACL検証結果:")
+    out += ["", "SHACL検証結果:"]
     validation = result["validation"]
     if validation["conforms"]:
-        print("  ✓ データは全ての制約に適合しています")
+        out.append("  ✓ データは全ての制約に適合しています")
     else:
-        print("  ✗ 検証エラーがあります")
-        print(validation["message"][:500])
+        out.append("  ✗ 検証エラーがあります")
+        out.append(validation["message"][:500])
+
+    sys.stdout.write("\n".join(out) + "\n")
 
     # Fusekiアップロード
     if args.upload:
@@ -170,33 +229,58 @@ def main():
             dataset=args.fuseki_dataset
         )
 
-        # 接続確認
-        if not uploader.check_connection():
-            print(f"  ✗ Fusekiサーバーに接続できません: {args.fuseki_endpoint}")
-            print("    サーバーが起動しているか確認してください。")
-        else:
-            print(f"  ✓ Fusekiサーバーに接続しました")
-
-            # アップロード実行
-            rdf_path = result["output_files"]["rdf_latest"]
-            upload_result = uploader.upload_file(
-                rdf_path,
-                replace=args.replace
-            )
-
-            if upload_result["success"]:
-                print(f"  ✓ アップロード成功")
-
-                # 統計情報を取得
-                stats = uploader.get_statistics()
-                print(f"  トリプル数: {stats['total_triples']}")
-
-                if stats["class_counts"]:
-                    print(f"  クラス別インスタンス数:")
-                    for cls, count in list(stats["class_counts"].items())[:10]:
-                        print(f"    {cls}: {count}")
+        rdf_path = result["output_files"]["rdf_latest"]
+        rdf_bytes = result.get("rdf_bytes")
+        # 前回アップロードしたRDF（--delta の差分の基準）
+        uploaded_path = Path(args.output) / "knowledge_graph_uploaded.ttl"
+
+        # 置換時はバルクローダーを優先（Fuseki停止中のみ可能。失敗したらHTTPで送信）
+        bulk_loaded = False
+        if args.bulk_load and args.replace:
+            bulk_result = uploader.bulk_load(rdf_path, args.tdb_path, replace=True)
+            if bulk_result["success"]:
+                bulk_loaded = True
+                print(f"  ✓ バルクロード成功: {bulk_result['location']}")
+                print("    Fusekiを起動するとデータが反映されます。")
+                save_uploaded_snapshot(rdf_path, uploaded_path)
+            else:
+                print(f"  バルクロードできません: {bulk_result.get('error')}（HTTPで送信します）")
+
+        # HTTPで送信（バルクロード済みの場合はFuseki停止中のため行わない）
+        if not bulk_loaded:
+            # 接続確認
+            if not uploader.check_connection():
+                print(f"  ✗ Fusekiサーバーに接続できません: {args.fuseki_endpoint}")
+                print("    サーバーが起動しているか確認してください。")
             else:
-                print(f"  ✗ アップロード失敗: {upload_result.get('error', '不明なエラー')}")
+                print(f"  ✓ Fusekiサーバーに接続しました")
+
+                # アップロード実行
+                if args.delta:
+                    upload_result = uploader.upload_delta(str(uploaded_path), rdf_path)
+                else:
+                    upload_result = uploader.upload_file(
+                        rdf_path,
+                        replace=args.replace,
+                        data=rdf_bytes
+                    )
+
+                if upload_result["success"]:
+                    print(f"  ✓ アップロード成功")
+                    if "inserted" in upload_result:
+                        print(f"  差分: +{upload_result['inserted']} / -{upload_result['deleted']}")
+                    save_uploaded_snapshot(rdf_path, uploaded_path)
+
+                    # 統計情報を取得
+                    stats = uploader.get_statistics()
+                    print(f"  トリプル数: {stats['total_triples']}")
+
+                    if stats["class_counts"]:
+                        print(f"  クラス別インスタンス数:")
+                        for cls, count in list(stats["class_counts"].items())[:10]:
+                            print(f"    {cls}: {count}")
+                else:
+                    print(f"  ✗ アップロード失敗: {upload_result.get('error', '不明なエラー')}")
 
     print("\n" + "=" * 60)
     print("完了")
@@ -10,7 +10,6 @@ FastAPIバックエンドサーバーを起動します。
 """
 
 import argparse
-import uvicorn
 
 
 def main():
@@ -37,6 +36,9 @@ def main():
 
     args = parser.parse_args()
 
+    # uvicorn の読み込みは --help 以外の場合のみ
+    import uvicorn
+
     print("=" * 60)
     print("NewsKG API Server")
     print("=" * 60)
@@ -73,12 +73,15 @@ def test_pipeline(max_articles: int = 3, reasoning: bool = True):
         max_articles=max_articles
     )
     
-    print("\n" + "-" * 40)
-    print("パイプライン結果:")
-    print(f"  成功: {result['success']}")
-    print(f"  処理時間: {result['elapsed_seconds']:.2f}秒")
-    print(f"  総トリプル数: {result['stats']['total_triples']}")
-    print(f"  出力ファイル: {result['output_files']['rdf_latest']}")
+    sys.stdout.write("\n".join([
+        "",
+        "-" * 40,
+        "パイプライン結果:",
+        f"  成功: {result['success']}",
+        f"  処理時間: {result['elapsed_seconds']:.2f}秒",
+        f"  総トリプル数: {result['stats']['total_triples']}",
+        f"  出力ファイル: {result['output_files']['rdf_latest']}",
+    ]) + "\n")
     
     return result
 
@@ -113,8 +116,7 @@ def main():
         
     except Exception as e:
         print(f"\n✗ エラー: {e}")
-        import traceback
-        traceback.print_exc()
+        logging.exception("テスト実行エラー")
         sys.exit(1)
 
 
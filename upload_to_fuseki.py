@@ -4,15 +4,40 @@ Fusekiにクリーンな状態でRDFデータをアップロードするスク
 """
 import requests
 import sys
+import zlib
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
 FUSEKI_URL = "http://172.28.64.1:3030/NewsKG"
 RDF_FILE = Path("output/knowledge_graph_v2_normalized.ttl")
+UPLOAD_CHUNK_SIZE = 1 << 20
+COUNT_QUERY_TIMEOUT_MS = 5000
+
+# clear / upload / count で同じ接続を再利用するセッション
+SESSION = requests.Session()
+SESSION.headers.update({"Accept": "application/sparql-results+json"})
+# ストリーム送信するPOSTは再送できないため、ステータス/読み取りエラーのリトライはGET/HEADのみ
+SESSION.mount("http://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=1,
+    max_retries=Retry(total=3, backoff_factor=0.2, allowed_methods=frozenset(["GET", "HEAD"]))
+))
+
+def iter_gzip_chunks(path: Path, chunk_size: int = UPLOAD_CHUNK_SIZE):
+    """ファイルを読みながらgzip圧縮したチャンクを順に返す"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip形式
+    with open(path, 'rb') as f:
+        while chunk := f.read(chunk_size):
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+    yield compressor.flush()
 
 def clear_fuseki(fuseki_url: str):
     """Fusekiのデータセットをクリア"""
     update_url = f"{fuseki_url}/update"
-    response = requests.post(
+    response = SESSION.post(
         update_url,
         data="CLEAR DEFAULT",
         headers={"Content-Type": "application/sparql-update"}
@@ -25,21 +50,33 @@ def upload_rdf(fuseki_url: str, rdf_file: Path):
     data_url = f"{fuseki_url}/data"
     
     print(f"アップロード中: {rdf_file}")
-    with open(rdf_file, 'rb') as f:
-        response = requests.post(
-            data_url,
-            data=f,
-            headers={"Content-Type": "text/turtle; charset=utf-8"}
-        )
+    # gzip圧縮しながらチャンク転送で送信（ファイル全体をメモリに載せない）
+    response = SESSION.post(
+        data_url,
+        data=iter_gzip_chunks(rdf_file),
+        headers={
+            "Content-Type": "text/turtle; charset=utf-8",
+            "Content-Encoding": "gzip",
+        }
+    )
     response.raise_for_status()
     print(f"✓ {rdf_file.name} をアップロードしました")
 
 def count_triples(fuseki_url: str) -> int:
-    """トリプル数をカウント"""
+    """
+    トリプル数をカウント
+
+    Fusekiの /$/stats はリクエスト数の統計のみでトリプル数を持たないため、
+    SPARQLのCOUNTで数える（サーバー側のタイムアウトを指定して長時間の走査を防ぐ）
+    """
     query_url = f"{fuseki_url}/query"
-    response = requests.get(
+    response = SESSION.get(
         query_url,
-        params={"query": "SELECT (COUNT(*) as ?count) WHERE { ?s ?p ?o }"}
+        params={
+            "query": "SELECT (COUNT(*) as ?count) WHERE { ?s ?p ?o }",
+            "timeout": str(COUNT_QUERY_TIMEOUT_MS),
+        },
+        timeout=COUNT_QUERY_TIMEOUT_MS / 1000 + 5
     )
     response.raise_for_status()
     return int(response.json()['results']['bindings'][0]['count']['value'])